@@ -0,0 +1,28 @@
+"""
+ASGI config for Comparte Ride project.
+
+This module contains the ASGI application used by ASGI servers. It
+should expose a module-level variable named ``application``.
+
+Production is served through WSGI. On Django 3.2 every view is
+synchronous and the ASGI handler runs all of them, one at a time, on a
+single thread per process, so serving through ASGI would lower the
+concurrency of each worker.
+
+"""
+import os
+import sys
+
+from django.core.asgi import get_asgi_application
+
+# This allows easy placement of apps within the interior
+# cride directory.
+app_path = os.path.abspath(os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), os.pardir))
+sys.path.append(os.path.join(app_path, 'cride'))
+
+# We defer to a DJANGO_SETTINGS_MODULE already in the environment.
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.production")
+
+# This application object is used by any ASGI server configured to use this file.
+application = get_asgi_application()
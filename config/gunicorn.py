@@ -0,0 +1,11 @@
+"""Gunicorn config."""
+
+# Utilities
+from prometheus_client import multiprocess
+import os
+
+
+def child_exit(server, worker):
+    """Discard the live metrics files of exited workers."""
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        multiprocess.mark_process_dead(worker.pid)
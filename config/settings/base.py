@@ -84,6 +84,8 @@ AUTH_PASSWORD_VALIDATORS = [
 # Middlewares
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'cride.utils.metrics.MetricsMiddleware',
+    'cride.utils.timing.ServerTimingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -92,6 +94,18 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Server timing
+# Share of the requests answered with a Server-Timing header and logged.
+SERVER_TIMING_SAMPLE_RATE = env.float('SERVER_TIMING_SAMPLE_RATE', default=1.0)
+# Seconds between the logs of the timings aggregated per view.
+SERVER_TIMING_LOG_INTERVAL = env.int('SERVER_TIMING_LOG_INTERVAL', default=60)
+
+# Metrics
+# Bearer token required to read /metrics, empty to leave it open.
+METRICS_TOKEN = env('DJANGO_METRICS_TOKEN', default='')
+# Port Celery workers export their metrics on, empty to disable it.
+METRICS_WORKER_PORT = env.int('METRICS_WORKER_PORT', default=None)
+
 # Static files
 STATIC_ROOT = str(ROOT_DIR('staticfiles'))
 STATIC_URL = '/static/'
@@ -165,12 +179,19 @@ CELERYD_TASK_SOFT_TIME_LIMIT = 60
 # Django REST framework
 REST_FRAMEWORK = {
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'cride.utils.renderers.ORJSONRenderer',
+        'cride.utils.renderers.MessagePackRenderer',
         'rest_framework.renderers.BrowsableAPIRenderer',
     ],
+    'DEFAULT_PARSER_CLASSES': [
+        'cride.utils.parsers.ORJSONParser',
+        'cride.utils.parsers.MessagePackParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'cride.users.authentication.CachedTokenAuthentication',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
+    'DEFAULT_PAGINATION_CLASS': 'cride.utils.pagination.KeysetPagination',
     'PAGE_SIZE': 10,
 }
@@ -88,6 +88,18 @@ INSTALLED_APPS += ['gunicorn']  # noqa F405
 # WhiteNoise
 MIDDLEWARE.insert(1, 'whitenoise.middleware.WhiteNoiseMiddleware')  # noqa F405
 
+# Metrics
+METRICS_TOKEN = env('DJANGO_METRICS_TOKEN')
+
+# Server timing
+SERVER_TIMING_SAMPLE_RATE = env.float('SERVER_TIMING_SAMPLE_RATE', default=0.05)
+
+# Django REST Framework
+REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = [  # noqa F405
+    'cride.utils.renderers.ORJSONRenderer',
+    'cride.utils.renderers.MessagePackRenderer',
+]
+
 
 # Logging
 # A sample logging configuration. The only tangible logging
@@ -108,6 +120,9 @@ LOGGING = {
             'format': '%(levelname)s %(asctime)s %(module)s '
                       '%(process)d %(thread)d %(message)s'
         },
+        'structured': {
+            'format': '%(message)s'
+        },
     },
     'handlers': {
         'mail_admins': {
@@ -120,6 +135,11 @@ LOGGING = {
             'class': 'logging.StreamHandler',
             'formatter': 'verbose',
         },
+        'structured_console': {
+            'level': 'INFO',
+            'class': 'logging.StreamHandler',
+            'formatter': 'structured',
+        },
     },
     'loggers': {
         'django.request': {
@@ -131,6 +151,11 @@ LOGGING = {
             'level': 'ERROR',
             'handlers': ['console', 'mail_admins'],
             'propagate': True
+        },
+        'cride.timing': {
+            'level': 'INFO',
+            'handlers': ['structured_console'],
+            'propagate': False
         }
     }
 }
@@ -5,10 +5,15 @@ from django.urls import include, path
 from django.conf.urls.static import static
 from django.contrib import admin
 
+from cride.utils.metrics import export_metrics
+
 urlpatterns = [
     # Django Admin
     path(settings.ADMIN_URL, admin.site.urls),
 
+    # Prometheus
+    path('metrics', export_metrics, name='metrics'),
+
     path('', include(('cride.circles.urls', 'circles'), namespace='circles')),
     path('', include(('cride.users.urls', 'users'), namespace='users')),
     path('', include(('cride.rides.urls', 'users'), namespace='rides')),
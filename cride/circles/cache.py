@@ -0,0 +1,202 @@
+"""Circles cache.
+
+Circles and memberships are resolved on every circle scoped request,
+so they are kept in the configured cache and invalidated by the
+models signals. The public circles directory pages are cached as well
+under a generation bumped whenever a circle or a membership changes.
+"""
+
+# Django
+from django.core.cache import cache
+from django.db import transaction
+from django.http import Http404
+
+# Models
+from cride.circles.models import Circle, Membership
+
+# Metrics
+from cride.utils.metrics import DIRECTORY_CACHE_LOOKUPS
+
+# Utilities
+from collections import namedtuple
+from hashlib import md5
+import random
+
+CIRCLE_CACHE_TIMEOUT = 60 * 60
+CIRCLES_VERSION_KEY = 'circles:version'
+
+MEMBERSHIP_CACHE_TIMEOUT = 60 * 10
+
+DIRECTORY_CACHE_TIMEOUT = 60 * 5
+DIRECTORY_GENERATION_KEY = 'circles:directory:generation'
+DIRECTORY_STATS_KEYS = {
+    'hits': 'circles:directory:hits',
+    'misses': 'circles:directory:misses',
+}
+
+CachedMembership = namedtuple('CachedMembership', ['pk', 'is_admin'])
+
+
+def circle_cache_key(slug_name):
+    """Return the cache key of a circle."""
+    return 'circles:circle:{}'.format(slug_name)
+
+
+def new_version():
+    """Return a random seed for a counter, unlikely to match any value it held before."""
+    return random.SystemRandom().getrandbits(62)
+
+
+def seed_version(key):
+    """Seed a missing counter and return its value."""
+    cache.add(key, new_version(), None)
+    return cache.get(key)
+
+
+def get_circle_or_404(slug_name):
+    """Return the circle with the given slug name.
+
+    Cached circles are stored along with the circles version they were
+    read at, so bumping the version invalidates all of them at once. The
+    version and the circle are fetched in a single cache round trip. An
+    evicted version is seeded at random, so the circles cached before
+    aren't used again.
+    """
+    key = circle_cache_key(slug_name)
+    cached = cache.get_many([CIRCLES_VERSION_KEY, key])
+    version = cached.get(CIRCLES_VERSION_KEY)
+    if version is None:
+        version = seed_version(CIRCLES_VERSION_KEY)
+
+    if key in cached and cached[key][0] == version:
+        return cached[key][1]
+
+    try:
+        circle = Circle.objects.get(slug_name=slug_name)
+    except Circle.DoesNotExist:
+        raise Http404('No Circle matches the given query.')
+    cache.set(key, (version, circle), CIRCLE_CACHE_TIMEOUT)
+    return circle
+
+
+def bump(key):
+    """Increment a cached counter, seeding it again if missing."""
+    try:
+        cache.incr(key)
+    except ValueError:
+        seed_version(key)
+
+
+def invalidate_circles():
+    """Bump the circles version and the directory generation.
+
+    Bumped now and once the transaction commits, so readers never cache
+    rows about to be replaced.
+    """
+    def bump_all():
+        bump(CIRCLES_VERSION_KEY)
+        bump(DIRECTORY_GENERATION_KEY)
+
+    bump_all()
+    transaction.on_commit(bump_all)
+
+
+def invalidate_circle(slug_name):
+    """Drop a single cached circle now and once the transaction commits.
+
+    Used when only the members count of a circle changes, so the other
+    circles stay cached. The directory pages show the count as well and
+    must be invalidated along, see invalidate_directory.
+    """
+    key = circle_cache_key(slug_name)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+def invalidate_directory():
+    """Bump the directory generation now and once the transaction commits."""
+    bump(DIRECTORY_GENERATION_KEY)
+    transaction.on_commit(lambda: bump(DIRECTORY_GENERATION_KEY))
+
+
+def directory_cache_key(request):
+    """Return the cache key of the requested directory page.
+
+    The generation must be read before the page is queried, so a page
+    computed while circles change is stored under a stale generation.
+    """
+    generation = cache.get(DIRECTORY_GENERATION_KEY)
+    if generation is None:
+        generation = seed_version(DIRECTORY_GENERATION_KEY)
+
+    # Pages hold absolute links, so the host is part of the key.
+    params = sorted(request.query_params.lists())
+    digest = md5(repr((request.scheme, request.get_host(), params)).encode()).hexdigest()
+    return 'circles:directory:{}:{}'.format(generation, digest)
+
+
+def get_directory_page(key):
+    """Return the cached directory page data, if any, and record the lookup."""
+    data = cache.get(key)
+    DIRECTORY_CACHE_LOOKUPS.labels(result='miss' if data is None else 'hit').inc()
+    stat = DIRECTORY_STATS_KEYS['misses' if data is None else 'hits']
+    if not cache.add(stat, 1, None):
+        cache.incr(stat)
+    return data
+
+
+def set_directory_page(key, data):
+    """Cache a directory page data."""
+    cache.set(key, data, DIRECTORY_CACHE_TIMEOUT)
+
+
+def get_directory_stats():
+    """Return the number of directory cache hits and misses."""
+    counters = cache.get_many(list(DIRECTORY_STATS_KEYS.values()))
+    return {stat: counters.get(key, 0) for stat, key in DIRECTORY_STATS_KEYS.items()}
+
+
+def membership_cache_key(user_id, circle_id):
+    """Return the cache key of a user membership in a circle."""
+    return 'circles:membership:{}:{}'.format(circle_id, user_id)
+
+
+def get_membership(user, circle, request=None):
+    """Return the active membership of the user in the circle, if any.
+
+    The membership is looked up in the request first and then in the
+    cache, so a request resolves each membership at most once.
+    """
+    if user is None or not user.is_authenticated:
+        return None
+
+    key = membership_cache_key(user.pk, circle.pk)
+    memo = None
+    if request is not None:
+        if not hasattr(request, '_memberships'):
+            request._memberships = {}
+        memo = request._memberships
+        if key in memo:
+            return memo[key]
+
+    membership = cache.get(key)
+    if membership is None:
+        membership = Membership.objects.filter(
+            user=user,
+            circle=circle,
+            is_active=True
+        ).values_list('pk', 'is_admin').first()
+        membership = CachedMembership(*membership) if membership else False
+        cache.set(key, membership, MEMBERSHIP_CACHE_TIMEOUT)
+
+    membership = membership or None
+    if memo is not None:
+        memo[key] = membership
+    return membership
+
+
+def invalidate_membership(user_id, circle_id):
+    """Drop a cached membership now and once the transaction commits."""
+    key = membership_cache_key(user_id, circle_id)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
@@ -0,0 +1,24 @@
+"""Directory cache stats command."""
+
+# Django
+from django.core.management.base import BaseCommand
+
+# Cache
+from cride.circles.cache import get_directory_stats
+
+
+class Command(BaseCommand):
+    """Directory cache stats command.
+
+    Print the hits and misses of the public circles directory cache
+    since the counters were created.
+    """
+
+    help = 'Print the public circles directory cache hit and miss counts.'
+
+    def handle(self, *args, **options):
+        stats = get_directory_stats()
+        lookups = stats['hits'] + stats['misses']
+        ratio = stats['hits'] / lookups if lookups else 0
+        self.stdout.write('Hits: {hits}\nMisses: {misses}'.format(**stats))
+        self.stdout.write('Hit ratio: {:.1%}'.format(ratio))
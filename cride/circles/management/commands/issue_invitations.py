@@ -0,0 +1,63 @@
+"""Issue invitations command."""
+
+# Django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+# Models
+from cride.circles.models import Circle, Invitation, Membership
+
+# Utilities
+from cride.utils.counters import increment
+
+
+class Command(BaseCommand):
+    """Issue invitations command.
+
+    Create a batch of invitation codes of a circle on behalf of one of
+    its members, e.g. to hand them out on onboarding events, and print
+    them one per line.
+    """
+
+    help = 'Issue a batch of invitation codes for a circle.'
+
+    MAX_COUNT = 100000
+
+    def add_arguments(self, parser):
+        parser.add_argument('slug_name', help='Circle slug name.')
+        parser.add_argument('count', type=int, help='Number of invitations to issue.')
+        parser.add_argument(
+            '--issuer',
+            required=True,
+            help='Username of the active circle member issuing the invitations.'
+        )
+
+    def handle(self, *args, **options):
+        count = options['count']
+        if not 0 < count <= self.MAX_COUNT:
+            raise CommandError('Count must be between 1 and {}.'.format(self.MAX_COUNT))
+
+        try:
+            circle = Circle.objects.get(slug_name=options['slug_name'])
+        except Circle.DoesNotExist:
+            raise CommandError('Circle "{}" does not exist.'.format(options['slug_name']))
+
+        try:
+            membership = Membership.objects.select_related('user').get(
+                circle=circle,
+                user__username=options['issuer'],
+                is_active=True
+            )
+        except Membership.DoesNotExist:
+            raise CommandError('"{}" is not an active member of the circle.'.format(options['issuer']))
+
+        with transaction.atomic():
+            invitations = Invitation.objects.create_batch(
+                count,
+                issued_by=membership.user,
+                circle=circle
+            )
+            increment(Membership.objects.filter(pk=membership.pk), remaining_invitations=count)
+
+        for invitation in invitations:
+            self.stdout.write(invitation.code)
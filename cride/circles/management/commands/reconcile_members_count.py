@@ -0,0 +1,63 @@
+"""Reconcile members count command."""
+
+# Django
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+# Models
+from cride.circles.models import Circle, Membership
+
+# Cache
+from cride.circles.cache import invalidate_circles
+
+
+class Command(BaseCommand):
+    """Reconcile members count command.
+
+    Recount the active members of every circle and overwrite the
+    maintained members count of the circles that drifted, e.g. after
+    memberships were edited from the admin.
+    """
+
+    help = 'Fix the circles members count drifted from their active memberships.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report the circles out of sync.'
+        )
+
+    def handle(self, *args, **options):
+        members = Membership.objects.filter(
+            circle=OuterRef('pk'),
+            is_active=True
+        ).order_by().values('circle').annotate(total=Count('pk')).values('total')
+        expected_members = Coalesce(Subquery(members, output_field=IntegerField()), 0)
+        circles = Circle.objects.annotate(
+            expected_members=expected_members
+        ).exclude(members_count=F('expected_members')).order_by('pk')
+
+        drifted = []
+        for circle in circles.iterator():
+            drifted.append(circle.pk)
+            self.stdout.write('{}: {} counted, {} active members.'.format(
+                circle.slug_name,
+                circle.members_count,
+                circle.expected_members
+            ))
+
+        if not drifted:
+            self.stdout.write(self.style.SUCCESS('Members count is in sync.'))
+        elif options['dry_run']:
+            self.stdout.write(self.style.WARNING('{} circles out of sync.'.format(len(drifted))))
+        else:
+            # Recount within the update so members joining meanwhile are not lost.
+            Circle.objects.filter(pk__in=drifted).update(
+                members_count=expected_members,
+                modified=timezone.now()
+            )
+            invalidate_circles()
+            self.stdout.write(self.style.SUCCESS('Fixed {} circles.'.format(len(drifted))))
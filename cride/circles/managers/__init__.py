@@ -1 +1,3 @@
+from .circles import CircleManager
 from .invitations import InvitationManager
+from .stats import CircleStatDeltaManager
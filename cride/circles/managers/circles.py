@@ -0,0 +1,60 @@
+"""Circle Managers."""
+
+# Django
+from django.db import models
+from django.db.models import F, IntegerField, OuterRef, Prefetch, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+
+class CircleQuerySet(models.QuerySet):
+    """Circle QuerySet."""
+
+    def with_pending_stats(self):
+        """Annotate the stats recorded but not yet folded into each circle."""
+        CircleStatDelta = self.model._meta.get_field('stat_deltas').related_model
+        pending = CircleStatDelta.objects.filter(circle=OuterRef('pk')).order_by().values('circle')
+        return self.annotate(**{
+            'pending_{}'.format(stat): Coalesce(
+                Subquery(
+                    pending.annotate(total=Sum(stat)).values('total'),
+                    output_field=IntegerField()
+                ),
+                0
+            )
+            for stat in CircleStatDelta.objects.STATS
+        })
+
+    def with_members(self, limit):
+        """Prefetch the active members of the circles having up to limit members."""
+        Membership = self.model._meta.get_field('membership').related_model
+        memberships = Membership.objects.filter(
+            is_active=True,
+            circle__members_count__lte=limit
+        ).select_related('user').order_by('pk')
+        return self.prefetch_related(
+            Prefetch('membership_set', queryset=memberships, to_attr='expanded_memberships')
+        )
+
+    def add_member(self, circle):
+        """Count a new member in unless the circle is full.
+
+        The limit is checked by the same UPDATE adding the member, so
+        concurrent joins can never exceed it. Return whether the member
+        was counted.
+        """
+        room = Q(is_limited=False) | Q(members_count__lt=F('members_limit'))
+        return self.filter(room, pk=circle.pk).update(
+            members_count=F('members_count') + 1,
+            modified=timezone.now()
+        ) == 1
+
+    def remove_member(self, circle):
+        """Count a member out of the circle."""
+        return self.filter(pk=circle.pk, members_count__gt=0).update(
+            members_count=F('members_count') - 1,
+            modified=timezone.now()
+        ) == 1
+
+
+CircleManager = models.Manager.from_queryset(CircleQuerySet)
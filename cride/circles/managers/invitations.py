@@ -1,10 +1,10 @@
 """Circle Invitation Managers."""
 
 # Django
-from django.db import models
+from django.db import IntegrityError, models, transaction
 
 # Utilities
-import random
+import secrets
 from string import ascii_uppercase, digits
 
 
@@ -15,12 +15,34 @@ class InvitationManager(models.Manager):
     """
 
     CODE_LENGTH = 10
+    CODE_POOL = ascii_uppercase + digits
+
+    BATCH_ATTEMPTS = 5
+
+    def generate_code(self):
+        """Return a random invitation code."""
+        return ''.join(secrets.choice(self.CODE_POOL) for _ in range(self.CODE_LENGTH))
 
     def create(self, *args, **kwargs):
         """Handle code creation."""
-        pool = ascii_uppercase + digits
-        code = kwargs.get('code', ''.join(random.choices(pool, k=self.CODE_LENGTH)))
+        code = kwargs.get('code', self.generate_code())
         while self.filter(code=code).exists():
-            code = ''.join(random.choices(pool, k=self.CODE_LENGTH))
+            code = self.generate_code()
         kwargs['code'] = code
         return super(InvitationManager, self).create(*args, **kwargs)
+
+    def create_batch(self, count, **kwargs):
+        """Create a batch of invitations with a single insert.
+
+        Codes are random enough for collisions to be very unlikely, so
+        instead of checking every code beforehand the unique index is
+        trusted and the batch is retried with new codes on a conflict.
+        """
+        for attempt in range(self.BATCH_ATTEMPTS):
+            invitations = [self.model(code=self.generate_code(), **kwargs) for _ in range(count)]
+            try:
+                with transaction.atomic():
+                    return self.bulk_create(invitations, batch_size=1000)
+            except IntegrityError:
+                if attempt == self.BATCH_ATTEMPTS - 1:
+                    raise
@@ -0,0 +1,47 @@
+"""Circle Stats Managers."""
+
+# Django
+from django.db import models, transaction
+
+# Utilities
+from collections import defaultdict
+from cride.utils.counters import increment
+
+
+class CircleStatDeltaManager(models.Manager):
+    """Circle Stat Delta Manager.
+
+    Used to record circle stats changes without locking the circle row
+    and to periodically fold them into the circle's columns.
+    """
+
+    STATS = ('rides_offered', 'rides_taken')
+
+    def record(self, circle, **deltas):
+        """Append a stats change of the circle."""
+        return self.create(circle=circle, **deltas)
+
+    def fold(self, batch_size=5000):
+        """Add a batch of pending deltas to their circles and discard them.
+
+        Return the number of deltas folded.
+        """
+        Circle = self.model._meta.get_field('circle').related_model
+        with transaction.atomic():
+            deltas = list(
+                self.select_for_update(skip_locked=True)
+                .order_by('pk')
+                .values_list('pk', 'circle_id', *self.STATS)[:batch_size]
+            )
+            if not deltas:
+                return 0
+
+            totals = defaultdict(lambda: defaultdict(int))
+            for _, circle_id, *values in deltas:
+                for stat, value in zip(self.STATS, values):
+                    totals[circle_id][stat] += value
+            for circle_id, stats in totals.items():
+                increment(Circle.objects.filter(pk=circle_id), **stats)
+
+            self.filter(pk__in=[delta[0] for delta in deltas]).delete()
+        return len(deltas)
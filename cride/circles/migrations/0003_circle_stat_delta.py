@@ -0,0 +1,30 @@
+# Generated by Django 3.2.25 on 2026-10-18 19:54
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('circles', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CircleStatDelta',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(auto_now=True, help_text='Date time on which the object was created', verbose_name='created_at')),
+                ('modified', models.DateTimeField(auto_now_add=True, help_text='Date time on which the object was last modified', verbose_name='modified_at')),
+                ('rides_offered', models.IntegerField(default=0)),
+                ('rides_taken', models.IntegerField(default=0)),
+                ('circle', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stat_deltas', to='circles.circle')),
+            ],
+            options={
+                'ordering': ['-created', '-modified'],
+                'get_latest_by': 'created',
+                'abstract': False,
+            },
+        ),
+    ]
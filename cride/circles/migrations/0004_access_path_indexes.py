@@ -0,0 +1,45 @@
+# Generated by Django 3.2.25 on 2026-10-18 19:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('circles', '0003_circle_stat_delta'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='circlestatdelta',
+            options={'get_latest_by': 'created'},
+        ),
+        migrations.AlterModelOptions(
+            name='invitation',
+            options={'get_latest_by': 'created'},
+        ),
+        migrations.AlterModelOptions(
+            name='membership',
+            options={'get_latest_by': 'created'},
+        ),
+        migrations.AddIndex(
+            model_name='circle',
+            index=models.Index(condition=models.Q(('public', True)), fields=['-rides_offered', 'rides_taken', 'id'], name='circles_circle_directory_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='invitation',
+            index=models.Index(condition=models.Q(('used', False)), fields=['circle', 'issued_by'], name='circles_invitation_unused_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='membership',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['circle', 'user'], name='circles_membership_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='membership',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['circle', 'id'], name='circles_membership_listing_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='membership',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['circle', 'invited_by'], name='circles_membership_invited_idx'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 3.2.25 on 2026-10-18 20:02
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_members_count(apps, schema_editor):
+    """Count the active members of the existing circles."""
+    Circle = apps.get_model('circles', 'Circle')
+    Membership = apps.get_model('circles', 'Membership')
+
+    members = Membership.objects.filter(
+        circle=OuterRef('pk'),
+        is_active=True
+    ).order_by().values('circle').annotate(total=Count('pk')).values('total')
+    Circle.objects.update(members_count=Coalesce(Subquery(members, output_field=IntegerField()), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('circles', '0004_access_path_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='circle',
+            name='circles_circle_directory_idx',
+        ),
+        migrations.AddField(
+            model_name='circle',
+            name='members_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_members_count, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='circle',
+            index=models.Index(condition=models.Q(('public', True)), fields=['-members_count', '-rides_offered', 'rides_taken', 'id'], name='circles_circle_directory_idx'),
+        ),
+    ]
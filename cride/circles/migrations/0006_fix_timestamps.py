@@ -0,0 +1,62 @@
+# Generated by Django 3.2.25 on 2026-10-18 20:11
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def swap_timestamps(apps, schema_editor):
+    """Swap the creation and modification dates saved with the fields mixed up."""
+    for name in ['Circle', 'CircleStatDelta', 'Invitation', 'Membership']:
+        model = apps.get_model('circles', name)
+        model.objects.update(created=F('modified'), modified=F('created'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('circles', '0005_circle_members_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(swap_timestamps, swap_timestamps),
+        migrations.AlterField(
+            model_name='circle',
+            name='created',
+            field=models.DateTimeField(auto_now_add=True, help_text='Date time on which the object was created', verbose_name='created_at'),
+        ),
+        migrations.AlterField(
+            model_name='circle',
+            name='modified',
+            field=models.DateTimeField(auto_now=True, help_text='Date time on which the object was last modified', verbose_name='modified_at'),
+        ),
+        migrations.AlterField(
+            model_name='circlestatdelta',
+            name='created',
+            field=models.DateTimeField(auto_now_add=True, help_text='Date time on which the object was created', verbose_name='created_at'),
+        ),
+        migrations.AlterField(
+            model_name='circlestatdelta',
+            name='modified',
+            field=models.DateTimeField(auto_now=True, help_text='Date time on which the object was last modified', verbose_name='modified_at'),
+        ),
+        migrations.AlterField(
+            model_name='invitation',
+            name='created',
+            field=models.DateTimeField(auto_now_add=True, help_text='Date time on which the object was created', verbose_name='created_at'),
+        ),
+        migrations.AlterField(
+            model_name='invitation',
+            name='modified',
+            field=models.DateTimeField(auto_now=True, help_text='Date time on which the object was last modified', verbose_name='modified_at'),
+        ),
+        migrations.AlterField(
+            model_name='membership',
+            name='created',
+            field=models.DateTimeField(auto_now_add=True, help_text='Date time on which the object was created', verbose_name='created_at'),
+        ),
+        migrations.AlterField(
+            model_name='membership',
+            name='modified',
+            field=models.DateTimeField(auto_now=True, help_text='Date time on which the object was last modified', verbose_name='modified_at'),
+        ),
+    ]
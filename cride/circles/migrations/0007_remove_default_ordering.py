@@ -0,0 +1,17 @@
+# Generated by Django 3.2.25 on 2026-10-18 20:36
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('circles', '0006_fix_timestamps'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='circle',
+            options={'get_latest_by': 'created'},
+        ),
+    ]
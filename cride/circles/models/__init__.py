@@ -1,3 +1,4 @@
 from .circles import Circle
 from .memberships import Membership
 from .invitations import Invitation
+from .stats import CircleStatDelta
@@ -3,6 +3,9 @@
 # Django
 from django.db import models
 
+# Managers
+from cride.circles.managers import CircleManager
+
 # Utilities
 from cride.utils.models import CRideModel
 
@@ -27,7 +30,10 @@ class Circle(CRideModel):
         through_fields=['circle', 'user']
     )
 
-    # Stats
+    # Active members, maintained along with the memberships.
+    members_count = models.PositiveIntegerField(default=0)
+
+    # Stats, pending changes are kept in CircleStatDelta until folded.
     rides_offered = models.PositiveIntegerField(default=0)
     rides_taken = models.PositiveIntegerField(default=0)
 
@@ -52,6 +58,9 @@ class Circle(CRideModel):
         help_text='If circle is limited, this will be the limit of the number of members.'
     )
 
+    # Manager
+    objects = CircleManager()
+
     def __str__(self):
         """Return Circle name."""
         return self.slug_name
@@ -59,4 +68,11 @@ class Circle(CRideModel):
     class Meta(CRideModel.Meta):
         """Meta Class."""
 
-        ordering = ['-rides_taken', '-rides_offered']
+        indexes = [
+            # Public circles directory
+            models.Index(
+                fields=['-members_count', '-rides_offered', 'rides_taken', 'id'],
+                condition=models.Q(public=True),
+                name='circles_circle_directory_idx'
+            ),
+        ]
@@ -49,3 +49,15 @@ class Invitation(CRideModel):
     def __str__(self):
         """Returns circle's slug_name and code."""
         return "#{}: {}".format(self.circle.slug_name, self.code)
+
+    class Meta(CRideModel.Meta):
+        """Meta class."""
+
+        indexes = [
+            # Member's unused invitations
+            models.Index(
+                fields=['circle', 'issued_by'],
+                condition=models.Q(used=False),
+                name='circles_invitation_unused_idx'
+            ),
+        ]
@@ -51,3 +51,27 @@ class Membership(CRideModel):
             self.user.username,
             self.circle.slug_name
         )
+
+    class Meta(CRideModel.Meta):
+        """Meta class."""
+
+        indexes = [
+            # Membership checks
+            models.Index(
+                fields=['circle', 'user'],
+                condition=models.Q(is_active=True),
+                name='circles_membership_active_idx'
+            ),
+            # Circle's members listing
+            models.Index(
+                fields=['circle', 'id'],
+                condition=models.Q(is_active=True),
+                name='circles_membership_listing_idx'
+            ),
+            # Members invited by a member
+            models.Index(
+                fields=['circle', 'invited_by'],
+                condition=models.Q(is_active=True),
+                name='circles_membership_invited_idx'
+            ),
+        ]
@@ -0,0 +1,40 @@
+"""Circle Stats Model."""
+
+# Django
+from django.db import models
+
+# Managers
+from cride.circles.managers import CircleStatDeltaManager
+
+# Utilities
+from cride.utils.models import CRideModel
+
+
+class CircleStatDelta(CRideModel):
+    """Circle Stat Delta Model.
+
+    Append-only record of a change in a circle's stats. Busy circles
+    get many rides at once, so instead of updating the circle row on
+    every ride the changes are recorded here and periodically folded
+    into the circle.
+    """
+
+    circle = models.ForeignKey(
+        'circles.Circle',
+        on_delete=models.CASCADE,
+        related_name='stat_deltas'
+    )
+
+    rides_offered = models.IntegerField(default=0)
+    rides_taken = models.IntegerField(default=0)
+
+    # Manager
+    objects = CircleStatDeltaManager()
+
+    def __str__(self):
+        """Return circle and deltas."""
+        return '#{}: +{} offered, +{} taken'.format(
+            self.circle_id,
+            self.rides_offered,
+            self.rides_taken
+        )
@@ -3,22 +3,13 @@
 # Django REST Framework
 from rest_framework.permissions import BasePermission
 
-# Models
-from cride.circles.models import Membership
+# Cache
+from cride.circles.cache import get_membership
 
 class IsCircleAdmin(BasePermission):
     """Allow access only to circle's admins."""
 
     def has_object_permission(self, request, view, obj):
         """Verify that the user has a Membership in the object."""
-
-        try:
-            Membership.objects.get(
-                user=request.user,
-                circle=obj,
-                is_admin=True,
-                is_active=True
-            )
-        except Membership.DoesNotExist:
-            return False
-        return True
+        membership = get_membership(request.user, obj, request)
+        return membership is not None and membership.is_admin
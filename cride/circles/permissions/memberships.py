@@ -3,8 +3,8 @@
 # Django REST Framework
 from rest_framework import permissions
 
-# Models
-from cride.circles.models import Membership
+# Cache
+from cride.circles.cache import get_membership
 
 
 class IsActiveCircleMember(permissions.BasePermission):
@@ -16,15 +16,7 @@ class IsActiveCircleMember(permissions.BasePermission):
 
     def has_permission(self, request, view):
         """Verify user is an active member of a circle."""
-        try:
-            Membership.objects.get(
-                circle=view.circle,
-                user=request.user,
-                is_active=True
-            )
-        except Membership.DoesNotExist:
-            return False
-        return True
+        return get_membership(request.user, view.circle, request) is not None
 
 class IsSelfMember(permissions.BasePermission):
     """Allow access only to the membership owner."""
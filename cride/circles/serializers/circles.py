@@ -2,15 +2,33 @@
 
 # Django REST Framework
 from rest_framework import serializers
+from rest_framework.reverse import reverse
 
 # Models
 from cride.circles.models import Circle
 
 
+def expands_members(request):
+    """Return whether the request asks for the circles members embedded."""
+    if request is None:
+        return False
+    return 'members' in request.query_params.get('expand', '').split(',')
+
+
 class CircleModelSerializer(serializers.ModelSerializer):
-    """Circle Serializer."""
+    """Circle Serializer.
+
+    Members are listed by the circle's paginated members endpoint.
+    With `?expand=members` the usernames of the circles having up to
+    MEMBERS_EXPAND_LIMIT members are embedded as well.
+    """
+
+    MEMBERS_EXPAND_LIMIT = 50
 
-    members = serializers.StringRelatedField(many=True, read_only=True)
+    members_url = serializers.SerializerMethodField()
+
+    rides_offered = serializers.SerializerMethodField()
+    rides_taken = serializers.SerializerMethodField()
 
     members_limit = serializers.IntegerField(
         required=False,
@@ -30,7 +48,8 @@ class CircleModelSerializer(serializers.ModelSerializer):
             'rides_offered',
             'verified',
             'public',
-            'members',
+            'members_count',
+            'members_url',
             'is_limited',
             'members_limit',
         )
@@ -38,10 +57,43 @@ class CircleModelSerializer(serializers.ModelSerializer):
         read_only_fields = (
             'public',
             'verified',
-            'rides_offered',
-            'rides_taken',
+            'members_count',
         )
 
+    def get_fields(self):
+        """Add the embedded members when they are requested."""
+        fields = super(CircleModelSerializer, self).get_fields()
+        if expands_members(self.context.get('request')):
+            fields['members'] = serializers.SerializerMethodField()
+        return fields
+
+    def get_members_url(self, obj):
+        """Return the circle's members endpoint."""
+        return reverse(
+            'circles:membership-list',
+            kwargs={'slug_name': obj.slug_name},
+            request=self.context.get('request')
+        )
+
+    def get_members(self, obj):
+        """Return the usernames of small circles members."""
+        if obj.members_count > self.MEMBERS_EXPAND_LIMIT:
+            return None
+        memberships = getattr(obj, 'expanded_memberships', None)
+        if memberships is None:
+            memberships = obj.membership_set.filter(
+                is_active=True
+            ).select_related('user').order_by('pk')[:self.MEMBERS_EXPAND_LIMIT]
+        return [str(membership.user) for membership in memberships]
+
+    def get_rides_offered(self, obj):
+        """Return the rides offered including the pending stats."""
+        return obj.rides_offered + getattr(obj, 'pending_rides_offered', 0)
+
+    def get_rides_taken(self, obj):
+        """Return the rides taken including the pending stats."""
+        return obj.rides_taken + getattr(obj, 'pending_rides_taken', 0)
+
     def validate(self, data):
         """Ensure both members_limit and is_limited are present."""
         members_limit = data.get('members_limit', 0)
@@ -10,7 +10,10 @@ from rest_framework import serializers
 from cride.users.serializers import UserModelSerializer
 
 # Models
-from cride.circles.models import Membership, Invitation
+from cride.circles.models import Circle, Membership, Invitation
+
+# Utilities
+from cride.utils.counters import increment
 
 
 class MembershipModelSerializer(serializers.ModelSerializer):
@@ -80,7 +83,7 @@ class AddMemberSerializer(serializers.Serializer):
     def validate(self, data):
         """Verify the members limit of the circle has not been reached."""
         circle = self.context['circle']
-        if circle.is_limited and circle.members.count() >= circle.members_limit:
+        if circle.is_limited and circle.members_count >= circle.members_limit:
             raise serializers.ValidationError('Circle has reached its members limit.')
 
         return super().validate(data)
@@ -93,6 +96,10 @@ class AddMemberSerializer(serializers.Serializer):
 
         now = timezone.now()
 
+        # count member in, the circle may have filled up since validation
+        if not Circle.objects.add_member(circle):
+            raise serializers.ValidationError('Circle has reached its members limit.')
+
         # create member
         member = Membership.objects.create(
             user=user,
@@ -108,12 +115,10 @@ class AddMemberSerializer(serializers.Serializer):
         invitation.save()
 
         # update issuer stats
-        issuer = Membership.objects.get(
-            circle=circle,
-            user=invitation.issued_by
+        increment(
+            Membership.objects.filter(circle=circle, user=invitation.issued_by),
+            used_invitations=1,
+            remaining_invitations=-1
         )
-        issuer.used_invitations += 1
-        issuer.remaining_invitations -= 1
-        issuer.save()
 
         return member
@@ -0,0 +1,36 @@
+"""Circles Signals."""
+
+# Django
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+# Models
+from cride.circles.models import Circle, Membership
+
+# Cache
+from cride.circles.cache import (
+    invalidate_circle,
+    invalidate_circles,
+    invalidate_directory,
+    invalidate_membership,
+)
+
+
+@receiver(post_save, sender=Circle)
+@receiver(post_delete, sender=Circle)
+def invalidate_cached_circles(sender, instance, **kwargs):
+    """Drop the cached circles when one changes."""
+    invalidate_circles()
+
+
+@receiver(post_save, sender=Membership)
+@receiver(post_delete, sender=Membership)
+def invalidate_cached_membership(sender, instance, **kwargs):
+    """Drop the cached membership and circle members count when it changes."""
+    invalidate_membership(instance.user_id, instance.circle_id)
+    invalidate_directory()
+    try:
+        invalidate_circle(instance.circle.slug_name)
+    except Circle.DoesNotExist:
+        # Deleted along with its circle, which invalidated every circle.
+        pass
@@ -0,0 +1,77 @@
+"""Circles cache tests."""
+
+# Django
+from django.core.cache import cache
+
+# Models
+from cride.circles.models import Circle, Membership
+from cride.users.models import Profile, User
+
+# Cache
+from cride.circles.cache import CIRCLES_VERSION_KEY, DIRECTORY_GENERATION_KEY, circle_cache_key, get_circle_or_404
+
+# Utilities
+import pytest
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def circle():
+    """Cached circle."""
+    circle = Circle.objects.create(name='Test', slug_name='test')
+    get_circle_or_404(circle.slug_name)
+    return circle
+
+
+@pytest.fixture
+def user():
+    """User with its profile."""
+    user = User.objects.create_user(
+        email='member@cride.test',
+        username='member',
+        password='cride-test-password',
+        first_name='Test',
+        last_name='User',
+    )
+    Profile.objects.create(user=user)
+    return user
+
+
+def get_generation():
+    """Return the current directory generation."""
+    return cache.get(DIRECTORY_GENERATION_KEY) or 1
+
+
+def test_circle_save_bumps_versions(circle):
+    version, generation = cache.get(CIRCLES_VERSION_KEY), get_generation()
+    circle.name = 'Renamed'
+    circle.save()
+    assert cache.get(CIRCLES_VERSION_KEY) > version
+    assert get_generation() > generation
+
+
+def test_membership_changes_bump_directory_generation(circle, user):
+    other = Circle.objects.create(name='Other', slug_name='other')
+    get_circle_or_404(other.slug_name)
+    version = cache.get(CIRCLES_VERSION_KEY)
+
+    generation = get_generation()
+    membership = Membership.objects.create(user=user, profile=user.profile, circle=circle)
+    assert get_generation() > generation
+    assert cache.get(circle_cache_key(circle.slug_name)) is None
+
+    generation = get_generation()
+    membership.delete()
+    assert get_generation() > generation
+
+    # Only the circle of the membership is dropped.
+    assert cache.get(CIRCLES_VERSION_KEY) == version
+    assert cache.get(circle_cache_key(other.slug_name)) is not None
+
+
+def test_evicted_version_does_not_revive_cached_circles(circle):
+    cache.delete(CIRCLES_VERSION_KEY)
+    Circle.objects.filter(pk=circle.pk).update(name='Renamed')
+    assert get_circle_or_404(circle.slug_name).name == 'Renamed'
@@ -0,0 +1,81 @@
+"""Circles views tests."""
+
+# Django
+from django.urls import reverse
+
+# Django REST Framework
+from rest_framework.test import APIClient
+
+# Models
+from cride.circles.models import Circle, Invitation, Membership
+from cride.users.models import Profile, User
+
+# Utilities
+import pytest
+
+
+pytestmark = pytest.mark.django_db
+
+
+def create_user(username):
+    """Create a verified user with its profile."""
+    user = User.objects.create_user(
+        email='{}@cride.test'.format(username),
+        username=username,
+        password='cride-test-password',
+        first_name='Test',
+        last_name='User',
+        is_verified=True,
+    )
+    Profile.objects.create(user=user)
+    return user
+
+
+def authenticate(user):
+    """Return a client authenticated as the user."""
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+def get_members_count(client, circle):
+    """Return the members count of the circle in the directory and its cache status."""
+    response = client.get(reverse('circles:circle-list'))
+    assert response.status_code == 200
+    counts = {data['slug_name']: data['members_count'] for data in response.data['results']}
+    return counts[circle.slug_name], response['X-Cache']
+
+
+@pytest.fixture
+def admin():
+    """Admin of the circle."""
+    return create_user('admin')
+
+
+@pytest.fixture
+def circle(admin):
+    """Public circle with its admin as only member."""
+    circle = Circle.objects.create(name='Test', slug_name='test', members_count=1)
+    Membership.objects.create(user=admin, profile=admin.profile, circle=circle, is_admin=True)
+    return circle
+
+
+def test_directory_shows_joined_and_left_members(admin, circle):
+    user = create_user('member')
+    client = authenticate(user)
+    assert get_members_count(client, circle) == (1, 'MISS')
+    assert get_members_count(client, circle) == (1, 'HIT')
+
+    invitation = Invitation.objects.create(issued_by=admin, circle=circle)
+    response = client.post(
+        reverse('circles:membership-list', kwargs={'slug_name': circle.slug_name}),
+        {'invitation_code': invitation.code}
+    )
+    assert response.status_code == 201
+    assert get_members_count(client, circle) == (2, 'MISS')
+
+    response = client.delete(
+        reverse('circles:membership-detail', kwargs={'slug_name': circle.slug_name, 'pk': user.username})
+    )
+    assert response.status_code == 204
+    assert get_members_count(client, circle) == (1, 'MISS')
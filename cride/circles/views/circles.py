@@ -2,6 +2,7 @@
 
 # Django REST framework
 from rest_framework import viewsets
+from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.exceptions import MethodNotAllowed
 
@@ -13,13 +14,19 @@ from django_filters.rest_framework import DjangoFilterBackend
 from cride.circles.models import Circle, Membership
 
 # Serializers
-from cride.circles.serializers import CircleModelSerializer
+from cride.circles.serializers import CircleModelSerializer, expands_members
 
 # Permissions
 from cride.circles.permissions import IsCircleAdmin
 
+# Views
+from cride.utils.views import ConditionalGetMixin
 
-class CircleViewSet(viewsets.ModelViewSet):
+# Cache
+from cride.circles.cache import directory_cache_key, get_directory_page, set_directory_page
+
+
+class CircleViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """Circle view set."""
 
     serializer_class = CircleModelSerializer
@@ -32,21 +39,58 @@ class CircleViewSet(viewsets.ModelViewSet):
     ordering_fields = [
         'rides_offered',
         'rides_taken',
+        'members_count',
         'reputation',
         'name',
         'created',
         'members_limit'
     ]
-    ordering = ['-members__count', '-rides_offered', 'rides_taken']
+    ordering = ['-members_count', '-rides_offered', 'rides_taken']
     filter_fields = ['verified', 'is_limited']
 
 
+    def list(self, request, *args, **kwargs):
+        """List public circles.
+
+        The directory is the same for every user, so its pages are
+        cached until a circle or a membership changes.
+        """
+        key = directory_cache_key(request)
+        data = get_directory_page(key)
+        if data is not None:
+            response = Response(data)
+            response['X-Cache'] = 'HIT'
+            return response
+
+        response = super(CircleViewSet, self).list(request, *args, **kwargs)
+        if response.status_code == 200:
+            set_directory_page(key, response.data)
+        response['X-Cache'] = 'MISS'
+        return response
+
     def get_queryset(self):
-        queryset = Circle.objects.all()
+        queryset = Circle.objects.with_pending_stats()
+        if expands_members(self.request):
+            queryset = queryset.with_members(CircleModelSerializer.MEMBERS_EXPAND_LIMIT)
         if self.action == 'list':
             return queryset.filter(public=True)
         return queryset
 
+    def get_object_stamps(self, instance):
+        """Return the circle's timestamp and the ones of its expanded members."""
+        memberships = getattr(instance, 'expanded_memberships', [])
+        return [instance.modified] + [membership.user.modified for membership in memberships]
+
+    def get_object_version(self, instance):
+        """Return the circle's version including its pending stats.
+
+        Pending stats change without touching the modified timestamp, so
+        no last modification date is returned.
+        """
+        version, _ = super(CircleViewSet, self).get_object_version(instance)
+        version = '{}:{}:{}'.format(version, instance.pending_rides_offered, instance.pending_rides_taken)
+        return version, None
+
     def get_permissions(self):
         """Assign permissions based on actions."""
         permissions = [IsAuthenticated,]
@@ -70,3 +114,5 @@ class CircleViewSet(viewsets.ModelViewSet):
             is_admin=True,
             remaining_invitations=10,
         )
+        Circle.objects.add_member(circle)
+        circle.refresh_from_db(fields=['members_count'])
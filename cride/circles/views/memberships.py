@@ -1,5 +1,9 @@
 """Circle's memberships views."""
 
+# Django
+from django.db.models import Count, Max
+from django.utils import timezone
+
 # Django REST Framework
 from rest_framework import mixins, viewsets, status
 from rest_framework.generics import get_object_or_404
@@ -13,11 +17,21 @@ from cride.circles.permissions.memberships import IsActiveCircleMember, IsSelfMe
 # Serializer
 from cride.circles.serializers import MembershipModelSerializer, AddMemberSerializer
 
+# Views
+from cride.circles.views.mixins import CircleNestedViewMixin
+from cride.utils.views import ConditionalGetMixin, StreamingListMixin
+
 # Model
 from cride.circles.models import Circle, Membership, Invitation
 
+# Cache
+from cride.circles.cache import invalidate_circle, invalidate_directory, invalidate_membership
+
 
-class MembershipViewset(mixins.ListModelMixin,
+class MembershipViewset(CircleNestedViewMixin,
+                        StreamingListMixin,
+                        ConditionalGetMixin,
+                        mixins.ListModelMixin,
                         mixins.RetrieveModelMixin,
                         mixins.CreateModelMixin,
                         mixins.DestroyModelMixin,
@@ -26,12 +40,6 @@ class MembershipViewset(mixins.ListModelMixin,
 
     serializer_class = MembershipModelSerializer
 
-    def dispatch(self, request, *args, **kwargs):
-        """Verifies that the circle exists."""
-        slug_name = kwargs['slug_name']
-        self.circle = get_object_or_404(Circle, slug_name=slug_name)
-        return super(MembershipViewset, self).dispatch(request, *args, **kwargs)
-
     def get_permissions(self):
         """Assign permissions based on the performed actions."""
         permissions = [IsAuthenticated]
@@ -46,21 +54,54 @@ class MembershipViewset(mixins.ListModelMixin,
         return Membership.objects.filter(
             circle=self.circle,
             is_active=True
+        ).select_related('user__profile', 'invited_by').order_by('pk')
+
+    def get_list_version(self):
+        """Return the circle's version along with the last change of its members.
+
+        The circle changes as members join or leave, the members and
+        their users and profiles are checked with a single query.
+        """
+        members = self.get_queryset().aggregate(
+            count=Count('pk'),
+            memberships=Max('modified'),
+            users=Max('user__modified'),
+            profiles=Max('user__profile__modified'),
+            inviters=Max('invited_by__modified'),
         )
+        return '{}:{}:{}'.format(self.circle.modified.isoformat(), self.circle.members_count, sorted(members.items()))
+
+    def get_object_stamps(self, instance):
+        """Return the membership's timestamp and the ones of its embedded users."""
+        stamps = [instance.modified, instance.user.modified, instance.user.profile.modified]
+        if instance.invited_by is not None:
+            stamps.append(instance.invited_by.modified)
+        return stamps
 
     def get_object(self):
         """Return circle member by providing the user's username."""
         return get_object_or_404(
-            Membership,
+            Membership.objects.select_related('user__profile', 'invited_by'),
             user__username=self.kwargs['pk'],
             circle=self.circle,
             is_active=True
         )
 
     def perform_destroy(self, instance):
-        """Set the Membership relation inactive."""
-        instance.is_active = False
-        instance.save()
+        """Set the Membership relation inactive.
+
+        Only the request actually deactivating the membership counts the
+        member out, so concurrent requests can't count it twice.
+        """
+        deactivated = Membership.objects.filter(pk=instance.pk, is_active=True).update(
+            is_active=False,
+            modified=timezone.now()
+        )
+        if deactivated:
+            Circle.objects.remove_member(self.circle)
+            invalidate_membership(instance.user_id, instance.circle_id)
+            invalidate_circle(self.circle.slug_name)
+            invalidate_directory()
 
     @action(detail=True, methods=['get'])
     def invitations(self, request, *args, **kwargs):
@@ -75,7 +116,7 @@ class MembershipViewset(mixins.ListModelMixin,
             circle=self.circle,
             invited_by=request.user,
             is_active=True
-        )
+        ).select_related('user__profile', 'invited_by')
 
         invitations = Invitation.objects.filter(
             circle=self.circle,
@@ -86,13 +127,14 @@ class MembershipViewset(mixins.ListModelMixin,
 
         diff = self.get_object().remaining_invitations - len(invitations)
 
-        for i in range(diff):
-            invitations.append(
-                Invitation.objects.create(
+        if diff > 0:
+            invitations += [
+                invitation.code for invitation in Invitation.objects.create_batch(
+                    diff,
                     issued_by=request.user,
                     circle=self.circle
-                ).code
-            )
+                )
+            ]
 
         data = {
             "used_invitations": MembershipModelSerializer(invited_members, many=True).data,
@@ -0,0 +1,21 @@
+"""Circle views mixins."""
+
+# Django
+from django.utils.functional import cached_property
+
+# Cache
+from cride.circles.cache import get_circle_or_404
+
+
+class CircleNestedViewMixin:
+    """Resolve the circle of views nested under circles/<slug_name>/.
+
+    The circle is looked up on first access, which happens once the
+    request has been authenticated, so rejected requests never pay
+    for it.
+    """
+
+    @cached_property
+    def circle(self):
+        """Return the circle from the URL."""
+        return get_circle_or_404(self.kwargs['slug_name'])
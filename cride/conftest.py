@@ -0,0 +1,15 @@
+"""Test fixtures."""
+
+# Django
+from django.core.cache import cache
+
+# Utilities
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start every test with an empty cache."""
+    cache.clear()
+    yield
+    cache.clear()
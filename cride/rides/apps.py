@@ -9,3 +9,7 @@ class RidesAppConfig(AppConfig):
 
     name = 'cride.rides'
     verbose_name = 'Rides'
+
+    def ready(self):
+        """Register signal handlers."""
+        import cride.rides.signals  # NOQA
@@ -0,0 +1,36 @@
+"""Rides cache.
+
+Circles rides listings are polled constantly, so each circle keeps a
+version stamp in the configured cache that changes whenever one of its
+listed rides does. Clients' copies are validated against it without
+querying the rides.
+"""
+
+# Django
+from django.core.cache import cache
+from django.db import transaction
+
+# Utilities
+from uuid import uuid4
+
+
+def rides_version_key(circle_id):
+    """Return the cache key of a circle's rides version."""
+    return 'rides:circle:{}:version'.format(circle_id)
+
+
+def get_rides_version(circle_id):
+    """Return the current version of a circle's rides."""
+    key = rides_version_key(circle_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid4().hex, None)
+        version = cache.get(key)
+    return version
+
+
+def invalidate_rides(circle_id):
+    """Change a circle's rides version now and once the transaction commits."""
+    key = rides_version_key(circle_id)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
@@ -0,0 +1,137 @@
+"""Rides Filters."""
+
+# Django
+from django.db import connection
+from django.db.models import Count, Exists, F, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import ASin, Coalesce, Cos, Power, Radians, Sin, Sqrt
+
+# Django REST Framework
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend, SearchFilter
+
+# Models
+from cride.rides.models import RideSearchTerm
+
+# Utilities
+from cride.utils.geo import EARTH_RADIUS_KM, bounding_box, geohash_cover
+from functools import reduce
+from math import cos, radians
+from operator import add, or_
+
+
+class RideSearchFilter(SearchFilter):
+    """Search rides by their departure and arrival locations.
+
+    On PostgreSQL every term is matched with lookups served by trigram
+    GIN indexes and rides are ranked by similarity. Other backends match
+    word prefixes stored in the RideSearchTerm table and rank rides by
+    the number of matched words. Relevance precedes the view's ordering.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        """Return the matching rides ranked by relevance."""
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+
+        if connection.vendor == 'postgresql':
+            queryset = self.filter_trigrams(queryset, terms, self.get_search_fields(view, request))
+        else:
+            tokens = RideSearchTerm.objects.tokenize(' '.join(terms))
+            if not tokens:
+                return queryset
+            queryset = self.filter_terms(queryset, tokens)
+
+        return queryset.order_by('-rank', *queryset.query.order_by)
+
+    def filter_trigrams(self, queryset, terms, search_fields):
+        """Match terms against the trigram indexed locations."""
+        from django.contrib.postgres.search import TrigramSimilarity
+
+        for term in terms:
+            queryset = queryset.filter(reduce(or_, [
+                Q(**{'{}__icontains'.format(field): term}) for field in search_fields
+            ]))
+        query = ' '.join(terms)
+        return queryset.annotate(rank=reduce(add, [
+            TrigramSimilarity(field, query) for field in search_fields
+        ]))
+
+    def filter_terms(self, queryset, tokens):
+        """Match tokens against the indexed location words."""
+        for token in tokens:
+            queryset = queryset.filter(Exists(
+                RideSearchTerm.objects.matching([token]).filter(ride=OuterRef('pk'))
+            ))
+        matches = RideSearchTerm.objects.matching(tokens).filter(
+            ride=OuterRef('pk')
+        ).order_by().values('ride').annotate(count=Count('pk')).values('count')
+        return queryset.annotate(rank=Coalesce(Subquery(matches, output_field=IntegerField()), 0))
+
+
+class RideProximityFilter(BaseFilterBackend):
+    """Filter rides departing near a coordinate.
+
+    ``?near=<lat>,<lon>&radius=<km>`` narrows the rides down with an indexed
+    geohash prefix lookup, refines them with a bounding box and the exact
+    great-circle distance, and orders them by that distance.
+    """
+
+    near_param = 'near'
+    radius_param = 'radius'
+
+    DEFAULT_RADIUS = 5
+    MAX_RADIUS = 100
+
+    def get_point(self, request):
+        """Return the (latitude, longitude, radius) requested, if any."""
+        near = request.query_params.get(self.near_param)
+        if not near:
+            return None
+
+        try:
+            latitude, longitude = [float(value) for value in near.split(',')]
+        except ValueError:
+            raise ValidationError({self.near_param: 'Expected "<latitude>,<longitude>".'})
+        if not -90 <= latitude <= 90 or not -180 <= longitude <= 180:
+            raise ValidationError({self.near_param: 'Coordinates out of range.'})
+
+        try:
+            radius = float(request.query_params.get(self.radius_param, self.DEFAULT_RADIUS))
+        except ValueError:
+            raise ValidationError({self.radius_param: 'A valid number is required.'})
+        if not 0 < radius <= self.MAX_RADIUS:
+            raise ValidationError({
+                self.radius_param: 'Radius must be greater than 0 and at most {} km.'.format(self.MAX_RADIUS)
+            })
+
+        return latitude, longitude, radius
+
+    def filter_queryset(self, request, queryset, view):
+        """Return the rides within the radius ordered by distance."""
+        point = self.get_point(request)
+        if point is None:
+            return queryset
+        latitude, longitude, radius = point
+
+        cells = Q()
+        for prefix in geohash_cover(latitude, longitude, radius):
+            cells |= Q(departure_geohash__startswith=prefix)
+
+        min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius)
+        lat, lon = radians(latitude), radians(longitude)
+        distance = 2 * EARTH_RADIUS_KM * ASin(Sqrt(
+            Power(Sin((Radians(F('departure_latitude')) - lat) / 2), 2) +
+            cos(lat) * Cos(Radians(F('departure_latitude'))) *
+            Power(Sin((Radians(F('departure_longitude')) - lon) / 2), 2)
+        ))
+
+        queryset = queryset.filter(
+            cells,
+            departure_latitude__range=(min_lat, max_lat),
+            departure_longitude__range=(min_lon, max_lon),
+        ).annotate(
+            distance=distance
+        ).filter(distance__lte=radius)
+
+        return queryset.order_by('distance', *queryset.query.order_by)
@@ -0,0 +1,336 @@
+"""Benchmark command."""
+
+# Django
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.runner import DiscoverRunner
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment
+from django.utils import timezone
+
+# Django REST Framework
+from rest_framework.test import APIClient
+
+# Models
+from cride.circles.models import Circle, Membership
+from cride.rides.models import Ride
+from cride.users.models import Profile, User
+
+# Celery
+from cride.taskapp.celery import app
+from cride.taskapp.tasks import gen_verification_token
+
+# Utilities
+from collections import defaultdict
+from datetime import timedelta
+from math import ceil
+from statistics import mean, median
+import json
+import time
+
+
+class Command(BaseCommand):
+    """Benchmark command.
+
+    Seed a dataset in a test database, then drive the ride lifecycle
+    through the API routes: signup, verification, login, circle
+    creation, invitation, joining the circle, offering a ride, joining
+    it, finishing it and rating it. The read endpoints of a seeded
+    circle are requested along.
+
+    Celery tasks run eagerly, so their cost is part of the latency of
+    the request triggering them. Latency percentiles and query counts
+    are reported per endpoint, optionally saved as JSON and compared
+    against a baseline. Query counts above their budget, or above the
+    baseline, fail the command. The test database is created next to
+    the configured one and destroyed afterwards.
+    """
+
+    help = 'Benchmark the ride lifecycle endpoints against a seeded test database.'
+
+    PASSWORD = 'benchmark-password'
+
+    # Maximum queries per request, they must not grow with the data.
+    QUERY_BUDGETS = {
+        'signup': 8,
+        'verify': 4,
+        'login': 7,
+        'create circle': 7,
+        'invitations': 10,
+        'join circle': 10,
+        'create ride': 8,
+        'join ride': 16,
+        'finish ride': 9,
+        'rate ride': 16,
+        'list circles': 3,
+        'circle detail': 3,
+        'list members': 5,
+        'list rides': 4,
+        'search rides': 4,
+        'ride detail': 4,
+        'user detail': 4,
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20, help='Lifecycles to run.')
+        parser.add_argument('--members', type=int, default=200, help='Members of the seeded circle.')
+        parser.add_argument('--rides', type=int, default=200, help='Upcoming rides of the seeded circle.')
+        parser.add_argument('--output', help='Write the results to this JSON file.')
+        parser.add_argument('--baseline', help='Compare the results against this JSON file.')
+        parser.add_argument(
+            '--save-baseline',
+            action='store_true',
+            help='Overwrite the baseline file with the results instead of comparing them.'
+        )
+        parser.add_argument(
+            '--tolerance',
+            type=float,
+            default=0.25,
+            help='Allowed p95 latency increase over the baseline, 0.25 is 25%%.'
+        )
+
+    def handle(self, *args, **options):
+        if options['iterations'] < 1:
+            raise CommandError('At least one iteration is required.')
+        if options['save_baseline'] and not options['baseline']:
+            raise CommandError('--save-baseline requires --baseline.')
+
+        # Tasks run within the requests triggering them, no broker needed.
+        app.conf.task_always_eager = True
+
+        setup_test_environment()
+        runner = DiscoverRunner(verbosity=0, interactive=False)
+        databases = runner.setup_databases()
+        try:
+            self.samples = defaultdict(list)
+            self.seed(options['members'], options['rides'])
+            for iteration in range(options['iterations']):
+                self.run_lifecycle(iteration)
+                self.run_reads()
+        finally:
+            runner.teardown_databases(databases)
+            teardown_test_environment()
+
+        results = {
+            'iterations': options['iterations'],
+            'members': options['members'],
+            'rides': options['rides'],
+            'database': connection.vendor,
+            'endpoints': {name: self.summarize(samples) for name, samples in self.samples.items()},
+        }
+        self.report(results['endpoints'])
+
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(results, output, indent=2)
+
+        failures = self.check_budgets(results['endpoints'])
+        if options['baseline']:
+            if options['save_baseline']:
+                with open(options['baseline'], 'w') as output:
+                    json.dump(results, output, indent=2)
+                self.stdout.write('Baseline saved to {}.'.format(options['baseline']))
+            else:
+                failures += self.compare(results['endpoints'], options['baseline'], options['tolerance'])
+
+        if failures:
+            raise CommandError('\n'.join(failures))
+        self.stdout.write(self.style.SUCCESS('Benchmark passed.'))
+
+    def seed(self, members, rides):
+        """Create a circle with members and upcoming rides to read from."""
+        password = make_password(self.PASSWORD)
+        User.objects.bulk_create([
+            User(
+                username='seed{}'.format(index),
+                email='seed{}@benchmark.cride'.format(index),
+                password=password,
+                first_name='Seed',
+                last_name='Member',
+                is_verified=True,
+            )
+            for index in range(max(members, 2))
+        ])
+        # Primary keys of bulk created rows are only set on PostgreSQL.
+        users = list(User.objects.filter(username__startswith='seed').order_by('pk'))
+        Profile.objects.bulk_create([Profile(user=user) for user in users])
+        profiles = {profile.user_id: profile for profile in Profile.objects.filter(user__in=users)}
+
+        circle = Circle.objects.create(name='Benchmark', slug_name='benchmark', members_count=len(users))
+        Membership.objects.bulk_create([
+            Membership(user=user, profile=profiles[user.pk], circle=circle, is_admin=index == 0)
+            for index, user in enumerate(users)
+        ])
+
+        now = timezone.now()
+        for index in range(rides):
+            departure = now + timedelta(hours=1, minutes=index)
+            ride = Ride.objects.create(
+                offered_by=users[index % len(users)],
+                offered_in=circle,
+                available_seats=3,
+                departure_location='Central Station {}'.format(index),
+                arrival_location='Campus North',
+                departure_date=departure,
+                arrival_date=departure + timedelta(hours=1),
+            )
+            ride.passengers.add(users[(index + 1) % len(users)])
+
+        self.reader = users[0]
+        self.reader_client = APIClient()
+        self.reader_client.force_authenticate(user=self.reader)
+        self.seeded_ride = Ride.objects.filter(offered_in=circle).order_by('pk').first()
+
+    def request(self, name, method, url, client, data=None):
+        """Time a request and record its query count."""
+        with CaptureQueriesContext(connection) as context:
+            start = time.perf_counter()
+            response = getattr(client, method)(url, data, format='json')
+            elapsed = time.perf_counter() - start
+
+        if response.status_code >= 400:
+            raise CommandError('{} {} answered {}: {}'.format(
+                method.upper(), url, response.status_code, getattr(response, 'data', response.content)
+            ))
+        self.samples[name].append((elapsed * 1000, len(context.captured_queries)))
+        return response
+
+    def signup(self, username):
+        """Sign a user up through the API and return an authenticated client."""
+        client = APIClient()
+        email = '{}@benchmark.cride'.format(username)
+        self.request('signup', 'post', '/users/signup/', client, {
+            'email': email,
+            'username': username,
+            'phone_number': '+5215555555555',
+            'password': self.PASSWORD,
+            'password_confirmation': self.PASSWORD,
+            'first_name': 'Bench',
+            'last_name': 'Mark',
+        })
+        token = gen_verification_token(User.objects.get(username=username))
+        self.request('verify', 'post', '/users/verify/', client, {'token': token})
+        response = self.request('login', 'post', '/users/login/', client, {
+            'email': email,
+            'password': self.PASSWORD,
+        })
+        client.credentials(HTTP_AUTHORIZATION='Token {}'.format(response.data['access_token']))
+        return client
+
+    def run_lifecycle(self, iteration):
+        """Drive a ride from the circle creation to its rating."""
+        driver = 'driver{}'.format(iteration)
+        driver_client = self.signup(driver)
+        passenger_client = self.signup('rider{}'.format(iteration))
+
+        slug_name = 'bench-{}'.format(iteration)
+        circle_url = '/circles/{}/'.format(slug_name)
+        self.request('create circle', 'post', '/circles/', driver_client, {
+            'name': 'Bench {}'.format(iteration),
+            'slug_name': slug_name,
+        })
+        response = self.request(
+            'invitations', 'get', '{}members/{}/invitations/'.format(circle_url, driver), driver_client
+        )
+        self.request('join circle', 'post', '{}members/'.format(circle_url), passenger_client, {
+            'invitation_code': response.data['unsued_invitations'][0],
+        })
+
+        departure = timezone.now() + timedelta(hours=1)
+        self.request('create ride', 'post', '{}rides/'.format(circle_url), driver_client, {
+            'available_seats': 3,
+            'departure_location': 'Central Station',
+            'arrival_location': 'Campus North',
+            'departure_date': departure.isoformat(),
+            'arrival_date': (departure + timedelta(hours=1)).isoformat(),
+        })
+        ride = Ride.objects.filter(offered_in__slug_name=slug_name).get()
+        ride_url = '{}rides/{}/'.format(circle_url, ride.pk)
+        self.request('join ride', 'post', '{}join/'.format(ride_url), passenger_client)
+
+        # Fast forward to the departure.
+        Ride.objects.filter(pk=ride.pk).update(departure_date=timezone.now() - timedelta(minutes=1))
+        self.request('finish ride', 'post', '{}finish/'.format(ride_url), driver_client)
+        self.request('rate ride', 'post', '{}rate/'.format(ride_url), passenger_client, {
+            'rating': 5,
+            'comments': 'On time.',
+        })
+
+    def run_reads(self):
+        """Request the read endpoints of the seeded circle."""
+        client = self.reader_client
+        self.request('list circles', 'get', '/circles/', client)
+        self.request('circle detail', 'get', '/circles/benchmark/', client)
+        self.request('list members', 'get', '/circles/benchmark/members/', client)
+        self.request('list rides', 'get', '/circles/benchmark/rides/', client)
+        self.request('search rides', 'get', '/circles/benchmark/rides/?search=central', client)
+        self.request('ride detail', 'get', '/circles/benchmark/rides/{}/'.format(self.seeded_ride.pk), client)
+        self.request('user detail', 'get', '/users/{}/'.format(self.reader.username), client)
+
+    def summarize(self, samples):
+        """Return the latency percentiles and query counts of an endpoint."""
+        latencies = sorted(latency for latency, _ in samples)
+        queries = [count for _, count in samples]
+        return {
+            'requests': len(samples),
+            'mean_ms': round(mean(latencies), 3),
+            'p50_ms': round(self.percentile(latencies, 50), 3),
+            'p95_ms': round(self.percentile(latencies, 95), 3),
+            'p99_ms': round(self.percentile(latencies, 99), 3),
+            'queries_median': median(queries),
+            'queries_max': max(queries),
+        }
+
+    def percentile(self, values, percent):
+        """Return the nearest-rank percentile of sorted values."""
+        return values[max(ceil(percent / 100 * len(values)) - 1, 0)]
+
+    def report(self, endpoints):
+        """Print the results table."""
+        row = '{:<14} {:>9} {:>9} {:>9} {:>9} {:>8}'
+        self.stdout.write(row.format('endpoint', 'p50 ms', 'p95 ms', 'p99 ms', 'mean ms', 'queries'))
+        for name, stats in endpoints.items():
+            self.stdout.write(row.format(
+                name,
+                '{:.2f}'.format(stats['p50_ms']),
+                '{:.2f}'.format(stats['p95_ms']),
+                '{:.2f}'.format(stats['p99_ms']),
+                '{:.2f}'.format(stats['mean_ms']),
+                stats['queries_max'],
+            ))
+
+    def check_budgets(self, endpoints):
+        """Return the endpoints exceeding their query budget."""
+        return [
+            '{}: {} queries, the budget is {}.'.format(name, stats['queries_max'], self.QUERY_BUDGETS[name])
+            for name, stats in endpoints.items()
+            if stats['queries_max'] > self.QUERY_BUDGETS.get(name, stats['queries_max'])
+        ]
+
+    def compare(self, endpoints, path, tolerance):
+        """Print the changes from the baseline and return the regressions."""
+        try:
+            with open(path) as baseline_file:
+                baseline = json.load(baseline_file)['endpoints']
+        except (OSError, ValueError, KeyError) as exc:
+            raise CommandError('Unable to read the baseline {}: {}'.format(path, exc))
+
+        regressions = []
+        self.stdout.write('Changes from {}:'.format(path))
+        for name, stats in endpoints.items():
+            if name not in baseline:
+                continue
+            before = baseline[name]
+            change = (stats['p95_ms'] - before['p95_ms']) / before['p95_ms'] if before['p95_ms'] else 0
+            self.stdout.write('{:<14} p95 {:+.1%}  queries {} -> {}'.format(
+                name, change, before['queries_max'], stats['queries_max']
+            ))
+            if change > tolerance:
+                regressions.append('{}: p95 went from {:.2f} ms to {:.2f} ms.'.format(
+                    name, before['p95_ms'], stats['p95_ms']
+                ))
+            if stats['queries_max'] > before['queries_max']:
+                regressions.append('{}: queries went from {} to {}.'.format(
+                    name, before['queries_max'], stats['queries_max']
+                ))
+        return regressions
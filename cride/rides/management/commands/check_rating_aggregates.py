@@ -0,0 +1,104 @@
+"""Check rating aggregates command."""
+
+# Django
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import (
+    Case,
+    Count,
+    F,
+    FloatField,
+    IntegerField,
+    OuterRef,
+    Q,
+    Subquery,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Abs, Coalesce
+
+# Models
+from cride.rides.models import Rating, Ride
+from cride.users.models import Profile
+
+# Utilities
+from cride.utils.counters import running_average
+
+
+class Command(BaseCommand):
+    """Check rating aggregates command.
+
+    Verify the rating sum, count and average kept on every ride and
+    profile are equal to the ones computed from all of their ratings.
+    """
+
+    help = 'Verify the rides and profiles rating aggregates against their ratings.'
+
+    TOLERANCE = 1e-6
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fix',
+            action='store_true',
+            help='Overwrite the out of sync aggregates with the computed ones.'
+        )
+
+    def handle(self, *args, **options):
+        targets = (
+            (Ride, 'ride', 'pk', 'rating', None),
+            (Profile, 'rated_user', 'user', 'reputation', Profile._meta.get_field('reputation').default),
+        )
+
+        out_of_sync = 0
+        for model, lookup, ref, field, default in targets:
+            queryset = self.get_out_of_sync(model, lookup, ref, field, default)
+            count = queryset.count()
+            out_of_sync += count
+            self.stdout.write('{}: {} out of sync.'.format(model._meta.verbose_name_plural, count))
+
+            if count and options['fix']:
+                for obj in queryset.iterator():
+                    model.objects.filter(pk=obj.pk).update(**{
+                        'rating_sum': obj.expected_sum,
+                        'rating_count': obj.expected_count,
+                        field: obj.expected_average,
+                    })
+
+        if out_of_sync and not options['fix']:
+            raise CommandError('{} rating aggregates are out of sync.'.format(out_of_sync))
+        if out_of_sync:
+            self.stdout.write(self.style.SUCCESS('Fixed {} rating aggregates.'.format(out_of_sync)))
+        else:
+            self.stdout.write(self.style.SUCCESS('Rating aggregates are in sync.'))
+
+    def get_out_of_sync(self, model, lookup, ref, field, default):
+        """Return the objects whose aggregates differ from their ratings."""
+        ratings = Rating.objects.filter(**{lookup: OuterRef(ref)}).order_by().values(lookup)
+        queryset = model.objects.annotate(
+            expected_sum=Coalesce(
+                Subquery(ratings.annotate(total=Sum('rating')).values('total'), output_field=FloatField()),
+                0.0
+            ),
+            expected_count=Coalesce(
+                Subquery(ratings.annotate(total=Count('pk')).values('total'), output_field=IntegerField()),
+                0
+            ),
+        ).annotate(
+            expected_average=Case(
+                When(expected_count__gt=0, then=running_average(F('expected_sum'), F('expected_count'))),
+                default=Value(default),
+                output_field=FloatField()
+            ),
+        ).annotate(
+            sum_error=Abs(F('rating_sum') - F('expected_sum')),
+            average_error=Abs(F(field) - F('expected_average')),
+        )
+
+        mismatch = ~Q(rating_count=F('expected_count')) | Q(sum_error__gt=self.TOLERANCE)
+        if default is None:
+            mismatch |= Q(expected_count=0, **{'{}__isnull'.format(field): False})
+            mismatch |= Q(expected_count__gt=0, **{'{}__isnull'.format(field): True})
+            mismatch |= Q(expected_count__gt=0, average_error__gt=self.TOLERANCE)
+        else:
+            mismatch |= Q(average_error__gt=self.TOLERANCE)
+        return queryset.filter(mismatch).order_by('pk')
@@ -0,0 +1,135 @@
+"""Explain queries command."""
+
+# Django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count, Q
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+
+# Django REST Framework
+from rest_framework.test import APIClient
+
+# Models
+from cride.circles.models import Circle, Membership
+
+# Utilities
+import re
+
+
+class Command(BaseCommand):
+    """Explain queries command.
+
+    Request every API endpoint of a sample circle against the current
+    database, run EXPLAIN on each SELECT they issue and flag the ones
+    scanning whole tables instead of using an index. Run it against a
+    seeded dataset, planners favour sequential scans on tiny tables.
+    """
+
+    help = 'Print the query plans of the API endpoints and flag sequential scans.'
+
+    SEQUENTIAL_SCAN = {
+        'postgresql': re.compile(r'Seq Scan on (\w+)'),
+        'sqlite': re.compile(r'SCAN (?:TABLE )?(\w+)\b(?! USING)'),
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument('--circle', help='Slug name of the circle to request, defaults to the largest.')
+        parser.add_argument('--user', help='Username of the member to request as, defaults to an admin.')
+        parser.add_argument(
+            '--analyze',
+            action='store_true',
+            help='Execute the queries to report actual timings (PostgreSQL only).'
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor not in self.SEQUENTIAL_SCAN:
+            raise CommandError('Unsupported database backend "{}".'.format(connection.vendor))
+
+        membership = self.get_membership(options['circle'], options['user'])
+        client = APIClient()
+        client.force_authenticate(user=membership.user)
+
+        flagged = 0
+        for label, url in self.get_endpoints(membership):
+            self.stdout.write(self.style.MIGRATE_HEADING('GET {} ({})'.format(url, label)))
+            for sql in self.capture(client, url):
+                flagged += self.explain(sql, options['analyze'])
+
+        if flagged:
+            self.stdout.write(self.style.WARNING('{} queries scan whole tables.'.format(flagged)))
+        else:
+            self.stdout.write(self.style.SUCCESS('Every query uses an index.'))
+
+    def get_membership(self, slug_name, username):
+        """Return the membership to request the endpoints with."""
+        memberships = Membership.objects.filter(is_active=True).select_related('user', 'circle')
+        if slug_name:
+            memberships = memberships.filter(circle__slug_name=slug_name)
+        else:
+            circle = Circle.objects.annotate(
+                active_members=Count('membership', filter=Q(membership__is_active=True))
+            ).order_by('-active_members').first()
+            memberships = memberships.filter(circle=circle)
+        if username:
+            memberships = memberships.filter(user__username=username)
+
+        membership = memberships.order_by('-is_admin', 'pk').first()
+        if membership is None:
+            raise CommandError('No active membership matches the given circle and user.')
+        return membership
+
+    def get_endpoints(self, membership):
+        """Return the (label, url) of the endpoints to explain."""
+        circle = {'slug_name': membership.circle.slug_name}
+        member = dict(circle, pk=membership.user.username)
+        return [
+            ('circles list', reverse('circles:circle-list')),
+            ('circle detail', reverse('circles:circle-detail', kwargs=circle)),
+            ('members list', reverse('circles:membership-list', kwargs=circle)),
+            ('member detail', reverse('circles:membership-detail', kwargs=member)),
+            ('member invitations', reverse('circles:membership-invitations', kwargs=member)),
+            ('rides list', reverse('rides:ride-list', kwargs=circle)),
+            ('rides search', reverse('rides:ride-list', kwargs=circle) + '?search=centro'),
+            ('user detail', reverse('users:users-detail', kwargs={'username': membership.user.username})),
+        ]
+
+    def capture(self, client, url):
+        """Return the SELECT statements issued by a request.
+
+        Requests are rolled back so endpoints creating rows, like the
+        invitations one, leave the dataset untouched.
+        """
+        with CaptureQueriesContext(connection) as context:
+            with override_settings(ALLOWED_HOSTS=['*']), transaction.atomic():
+                response = client.get(url, secure=True)
+                transaction.set_rollback(True)
+
+        if response.status_code >= 400:
+            self.stdout.write(self.style.ERROR('  {} response.'.format(response.status_code)))
+
+        return [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].lstrip().upper().startswith('SELECT')
+        ]
+
+    def explain(self, sql, analyze):
+        """Print the plan of a statement and return whether it scans a table."""
+        if connection.vendor == 'postgresql':
+            prefix = 'EXPLAIN (ANALYZE, BUFFERS) ' if analyze else 'EXPLAIN '
+        else:
+            prefix = 'EXPLAIN QUERY PLAN '
+
+        with connection.cursor() as cursor:
+            cursor.execute(prefix + sql)
+            plan = [' '.join(str(column) for column in row) for row in cursor.fetchall()]
+
+        scanned = set()
+        for line in plan:
+            scanned.update(self.SEQUENTIAL_SCAN[connection.vendor].findall(line))
+
+        style = self.style.WARNING if scanned else self.style.SQL_KEYWORD
+        self.stdout.write('  ' + style(sql))
+        for line in plan:
+            self.stdout.write('    ' + line)
+        return int(bool(scanned))
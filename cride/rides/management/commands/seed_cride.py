@@ -0,0 +1,371 @@
+"""Seed CRide command."""
+
+# Django
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+# Models
+from cride.circles.models import Circle, Invitation, Membership
+from cride.rides.models import Rating, Ride, RideSearchTerm
+from cride.users.models import Profile, User
+
+# Cache
+from cride.circles.cache import invalidate_circles
+from cride.rides.cache import invalidate_rides
+
+# Utilities
+from collections import OrderedDict
+from datetime import timedelta
+from itertools import accumulate
+from math import floor
+import random
+import time
+
+
+class Command(BaseCommand):
+    """Seed CRide command.
+
+    Fill the database with a synthetic dataset shaped like production:
+    circle sizes follow a power law, members join through invitations
+    of earlier members, rides cluster around a few places of a city at
+    commute hours from three months ago to two weeks ahead, past rides
+    are finished and most of their passengers rated them.
+
+    Rows are inserted with bulk_create in chunks, one transaction each,
+    with their primary keys assigned up front so related rows are built
+    without reading anything back. Counters and rating aggregates are
+    computed while generating, so the dataset passes
+    check_rating_aggregates and reconcile_members_count. The same seed
+    and parameters always produce the same rows.
+    """
+
+    help = 'Insert a synthetic dataset of users, circles, rides and ratings for scale testing.'
+
+    # Name, latitude and longitude.
+    PLACES = (
+        ('Centro Internacional', 4.6148, -74.0698),
+        ('Universidad Nacional', 4.6381, -74.0840),
+        ('Chapinero', 4.6486, -74.0628),
+        ('Parque de la 93', 4.6767, -74.0483),
+        ('Usaquén', 4.6951, -74.0309),
+        ('Suba', 4.7410, -74.0840),
+        ('Salitre', 4.6520, -74.1100),
+        ('Aeropuerto El Dorado', 4.7016, -74.1469),
+        ('Kennedy', 4.6280, -74.1520),
+        ('Unicentro', 4.7020, -74.0417),
+    )
+    CIRCLE_KINDS = ('Commuters', 'Students', 'Riders', 'Carpool', 'Workers', 'Neighbours')
+    FIRST_NAMES = ('Ana', 'Carlos', 'Daniela', 'David', 'Juan', 'Laura', 'María', 'Santiago', 'Sofía', 'Valentina')
+    LAST_NAMES = ('Díaz', 'García', 'Gómez', 'Hernández', 'López', 'Martínez', 'Pérez', 'Rodríguez', 'Torres')
+
+    # Relative frequency of each rating from 1 to 5.
+    RATING_WEIGHTS = (2, 3, 10, 35, 50)
+    # Departure hours, weighted towards the commute peaks.
+    HOUR_WEIGHTS = (0, 0, 0, 0, 0, 1, 4, 10, 8, 3, 2, 2, 3, 2, 2, 3, 5, 9, 8, 4, 2, 1, 1, 0)
+
+    PAST_DAYS = 90
+    FUTURE_DAYS = 14
+    MAX_SEATS = 4
+    ADMIN_INVITATIONS = 10
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000, help='Number of users.')
+        parser.add_argument('--circles', type=int, default=50, help='Number of circles.')
+        parser.add_argument(
+            '--memberships',
+            type=float,
+            default=2.0,
+            help='Average number of circles each user is a member of.'
+        )
+        parser.add_argument('--rides', type=int, default=10000, help='Number of rides.')
+        parser.add_argument(
+            '--rating-ratio',
+            type=float,
+            default=0.7,
+            help='Share of the passengers of finished rides rating them.'
+        )
+        parser.add_argument('--seed', type=int, default=0, help='Random seed, the same seed yields the same data.')
+        parser.add_argument('--chunk-size', type=int, default=5000, help='Rows inserted per transaction.')
+        parser.add_argument(
+            '--prefix',
+            default='seed',
+            help='Prefix of the usernames and circle slugs, must be unused.'
+        )
+        parser.add_argument('--password', default='cride-seed', help='Password of every seeded user.')
+
+    def handle(self, *args, **options):
+        if options['users'] < 2 or options['circles'] < 1 or options['chunk_size'] < 1:
+            raise CommandError('At least 2 users, 1 circle and a positive chunk size are required.')
+        if not 0 <= options['rating_ratio'] <= 1:
+            raise CommandError('The rating ratio must be between 0 and 1.')
+        if len(options['prefix']) > 20:
+            raise CommandError('The prefix must be 20 characters long at most.')
+
+        self.prefix = options['prefix']
+        if User.objects.filter(username__startswith=self.prefix + '_').exists() or \
+                Circle.objects.filter(slug_name__startswith=self.prefix + '-').exists():
+            raise CommandError('Rows prefixed with "{}" already exist, use another prefix.'.format(self.prefix))
+
+        self.rng = random.Random(options['seed'])
+        self.now = timezone.now()
+        self.chunk_size = options['chunk_size']
+        self.buffers = OrderedDict((model, []) for model in self.get_models())
+        self.inserted = OrderedDict((model, 0) for model in self.buffers)
+        self.next_pks = {
+            model: (model.objects.aggregate(last=Max('pk'))['last'] or 0) + 1
+            for model in self.buffers
+        }
+
+        start = time.perf_counter()
+        self.seed_users(options['users'], options['password'])
+        self.seed_circles(options['circles'], options['memberships'])
+        self.seed_rides(options['rides'], options['rating_ratio'])
+        self.seed_profiles()
+        self.seed_memberships()
+        self.flush()
+        self.finish()
+        elapsed = time.perf_counter() - start
+
+        total = 0
+        for model, count in self.inserted.items():
+            total += count
+            self.stdout.write('{}: {}'.format(model._meta.db_table, count))
+        self.stdout.write(self.style.SUCCESS('Inserted {} rows in {:.1f}s ({:.0f} rows/s).'.format(
+            total, elapsed, total / elapsed if elapsed else 0
+        )))
+
+    def get_models(self):
+        """Return the seeded models, each one after the ones it refers to."""
+        models = [User, Circle, Ride, Ride.passengers.through, Rating, Profile, Membership, Invitation]
+        if connection.vendor != 'postgresql':
+            # Other backends search rides through their stored terms.
+            models.insert(models.index(Rating), RideSearchTerm)
+        return models
+
+    def add(self, obj):
+        """Assign a primary key to an object and queue it for insertion."""
+        model = type(obj)
+        obj.pk = self.next_pks[model]
+        self.next_pks[model] += 1
+        self.buffers[model].append(obj)
+        if len(self.buffers[model]) >= self.chunk_size:
+            self.flush()
+        return obj.pk
+
+    def flush(self):
+        """Insert every queued object in a single transaction."""
+        with transaction.atomic():
+            for model, objs in self.buffers.items():
+                if objs:
+                    model.objects.bulk_create(objs, batch_size=self.chunk_size)
+                    self.inserted[model] += len(objs)
+                    objs.clear()
+
+    def average(self, total, count, default):
+        """Return the rounded average kept by the counters, see running_average."""
+        return floor(total * 10 / count + 0.5) / 10 if count else default
+
+    def seed_users(self, count, password):
+        """Queue the users, sharing a single password hash."""
+        password = make_password(password)
+        self.users = []
+        for index in range(count):
+            username = '{}_{}'.format(self.prefix, index)
+            self.users.append(self.add(User(
+                username=username,
+                email='{}@seed.cride'.format(username),
+                password=password,
+                first_name=self.rng.choice(self.FIRST_NAMES),
+                last_name=self.rng.choice(self.LAST_NAMES),
+                is_client=True,
+                is_verified=True,
+            )))
+        # Per user: rides offered, rides taken, rating sum, rating count.
+        self.user_stats = {pk: [0, 0, 0, 0] for pk in self.users}
+
+    def seed_circles(self, count, memberships):
+        """Queue the circles and draw their members.
+
+        Sizes are drawn from a Pareto distribution, so a few circles
+        hold most of the members as on the real directory.
+        """
+        weights = [self.rng.paretovariate(1.16) for _ in range(count)]
+        total = sum(weights)
+        self.circles = []
+        for index, weight in enumerate(weights):
+            size = min(len(self.users), max(2, round(len(self.users) * memberships * weight / total)))
+            is_limited = self.rng.random() < 0.2
+            circle = Circle(
+                name='{} {}'.format(self.rng.choice(self.PLACES)[0], self.rng.choice(self.CIRCLE_KINDS)),
+                slug_name='{}-{}'.format(self.prefix, index),
+                members_count=size,
+                verified=self.rng.random() < 0.1,
+                public=self.rng.random() < 0.8,
+                is_limited=is_limited,
+                members_limit=size + self.rng.randint(0, size) if is_limited else 0,
+            )
+            self.add(circle)
+            # Members in joining order, with their rides offered and taken.
+            circle.seeded_members = OrderedDict(
+                (user, [0, 0]) for user in self.rng.sample(self.users, size)
+            )
+            self.circles.append(circle)
+
+    def seed_rides(self, count, rating_ratio):
+        """Queue the rides along with their passengers, terms and ratings."""
+        circle_weights = list(accumulate(circle.members_count for circle in self.circles))
+        today = self.now.replace(hour=0, minute=0, second=0, microsecond=0)
+        through = Ride.passengers.through
+
+        for _ in range(count):
+            circle = self.rng.choices(self.circles, cum_weights=circle_weights)[0]
+            members = list(circle.seeded_members)
+            driver = self.rng.choice(members)
+            seats = self.rng.randint(1, self.MAX_SEATS)
+            candidates = [
+                member for member in self.rng.sample(members, min(seats + 1, len(members)))
+                if member != driver
+            ]
+            passengers = candidates[:self.rng.randint(0, min(seats, len(candidates)))]
+
+            departure = today + timedelta(
+                days=self.rng.randint(-self.PAST_DAYS, self.FUTURE_DAYS),
+                hours=self.rng.choices(range(24), weights=self.HOUR_WEIGHTS)[0],
+                minutes=self.rng.randint(0, 59),
+            )
+            arrival = departure + timedelta(minutes=self.rng.randint(15, 90))
+            origin, destination = self.rng.sample(self.PLACES, 2)
+
+            ride = Ride(
+                offered_by_id=driver,
+                offered_in=circle,
+                available_seats=seats - len(passengers),
+                departure_location='{} calle {}'.format(origin[0], self.rng.randint(1, 200)),
+                departure_date=departure,
+                departure_latitude=origin[1] + self.rng.gauss(0, 0.005),
+                departure_longitude=origin[2] + self.rng.gauss(0, 0.005),
+                arrival_location='{} calle {}'.format(destination[0], self.rng.randint(1, 200)),
+                arrival_date=arrival,
+                arrival_latitude=destination[1] + self.rng.gauss(0, 0.005),
+                arrival_longitude=destination[2] + self.rng.gauss(0, 0.005),
+                is_active=arrival > self.now,
+            )
+            ride.update_geohashes()
+
+            ratings = []
+            if not ride.is_active:
+                ratings = [
+                    (passenger, self.rng.choices(range(1, 6), weights=self.RATING_WEIGHTS)[0])
+                    for passenger in passengers if self.rng.random() < rating_ratio
+                ]
+            ride.rating_sum = sum(rating for _, rating in ratings)
+            ride.rating_count = len(ratings)
+            ride.rating = self.average(ride.rating_sum, ride.rating_count, None)
+            self.add(ride)
+
+            self.user_stats[driver][0] += 1
+            circle.seeded_members[driver][0] += 1
+            circle.rides_offered += 1
+            for passenger in passengers:
+                self.add(through(ride_id=ride.pk, user_id=passenger))
+                self.user_stats[passenger][1] += 1
+                circle.seeded_members[passenger][1] += 1
+                circle.rides_taken += 1
+
+            if RideSearchTerm in self.buffers:
+                terms = set()
+                for field in RideSearchTerm.objects.INDEXED_FIELDS:
+                    terms.update(RideSearchTerm.objects.tokenize(getattr(ride, field)))
+                for term in sorted(terms):
+                    self.add(RideSearchTerm(ride_id=ride.pk, term=term))
+
+            for passenger, rating in ratings:
+                self.add(Rating(
+                    ride_id=ride.pk,
+                    circle=circle,
+                    rating_user_id=passenger,
+                    rated_user_id=driver,
+                    rating=rating,
+                ))
+                self.user_stats[driver][2] += rating
+                self.user_stats[driver][3] += 1
+
+    def seed_profiles(self):
+        """Queue the profiles with the counters of their rides and ratings."""
+        default_reputation = Profile._meta.get_field('reputation').default
+        self.profiles = {}
+        for user in self.users:
+            offered, taken, rating_sum, rating_count = self.user_stats[user]
+            self.profiles[user] = self.add(Profile(
+                user_id=user,
+                rides_offered=offered,
+                rides_taken=taken,
+                rating_sum=rating_sum,
+                rating_count=rating_count,
+                reputation=self.average(rating_sum, rating_count, default_reputation),
+            ))
+
+    def seed_memberships(self):
+        """Queue the memberships and the invitations they joined with.
+
+        The first member of every circle is its admin, every other one
+        was invited by a member who joined before.
+        """
+        codes = set(Invitation.objects.values_list('code', flat=True).iterator())
+        for circle in self.circles:
+            members = list(circle.seeded_members)
+            inviters = [None] + [members[self.rng.randrange(position)] for position in range(1, len(members))]
+            used_invitations = {member: 0 for member in members}
+            for inviter in inviters[1:]:
+                used_invitations[inviter] += 1
+
+            for position, (member, inviter) in enumerate(zip(members, inviters)):
+                offered, taken = circle.seeded_members[member]
+                self.add(Membership(
+                    user_id=member,
+                    profile_id=self.profiles[member],
+                    circle=circle,
+                    is_admin=position == 0,
+                    used_invitations=used_invitations[member],
+                    remaining_invitations=self.ADMIN_INVITATIONS if position == 0 else 0,
+                    invited_by_id=inviter,
+                    rides_offered=offered,
+                    rides_taken=taken,
+                ))
+                if inviter is not None:
+                    self.add(Invitation(
+                        code=self.generate_code(codes),
+                        issued_by_id=inviter,
+                        used_by_id=member,
+                        circle=circle,
+                        used=True,
+                        used_at=self.now,
+                    ))
+
+    def generate_code(self, codes):
+        """Return an invitation code drawn from the seeded generator."""
+        pool = Invitation.objects.CODE_POOL
+        while True:
+            code = ''.join(self.rng.choice(pool) for _ in range(Invitation.objects.CODE_LENGTH))
+            if code not in codes:
+                codes.add(code)
+                return code
+
+    def finish(self):
+        """Store the circles stats, reset the sequences and the caches."""
+        Circle.objects.bulk_update(self.circles, ['rides_offered', 'rides_taken'], batch_size=self.chunk_size)
+
+        # Primary keys were assigned explicitly, move the sequences past them.
+        statements = connection.ops.sequence_reset_sql(no_style(), list(self.buffers))
+        if statements:
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
+
+        invalidate_circles()
+        for circle in self.circles:
+            invalidate_rides(circle.pk)
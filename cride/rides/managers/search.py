@@ -0,0 +1,44 @@
+"""Ride Search Term Managers."""
+
+# Django
+from django.db import models
+
+# Utilities
+import re
+import unicodedata
+
+
+class RideSearchTermManager(models.Manager):
+    """Ride Search Term Manager.
+
+    Used to tokenize the rides locations and keep their terms indexed.
+    """
+
+    TERM_LENGTH = 64
+    INDEXED_FIELDS = ('departure_location', 'arrival_location')
+
+    def tokenize(self, text):
+        """Return the lowercase, accent-free words of a text."""
+        text = unicodedata.normalize('NFKD', text or '')
+        text = ''.join(char for char in text if not unicodedata.combining(char))
+        return [word[:self.TERM_LENGTH] for word in re.findall(r'\w+', text.lower())]
+
+    def index(self, ride):
+        """Replace the stored terms of a ride."""
+        self.filter(ride=ride).delete()
+        terms = set()
+        for field in self.INDEXED_FIELDS:
+            terms.update(self.tokenize(getattr(ride, field)))
+        self.bulk_create([self.model(ride=ride, term=term) for term in terms])
+
+    def matching(self, tokens):
+        """Return the terms starting with any of the tokens.
+
+        Prefixes are looked up as ranges so the term index is used
+        regardless of the database collation.
+        """
+        query = models.Q()
+        for token in tokens:
+            upper_bound = token[:-1] + chr(ord(token[-1]) + 1)
+            query |= models.Q(term__gte=token, term__lt=upper_bound)
+        return self.filter(query)
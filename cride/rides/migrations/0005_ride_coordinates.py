@@ -0,0 +1,44 @@
+# Generated by Django 3.2.25 on 2026-10-18 19:50
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rides', '0004_rename_coments_rating_comments'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ride',
+            name='arrival_geohash',
+            field=models.CharField(blank=True, db_index=True, editable=False, help_text='Geohash of the arrival coordinates, used for proximity searches.', max_length=12),
+        ),
+        migrations.AddField(
+            model_name='ride',
+            name='arrival_latitude',
+            field=models.FloatField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(-90), django.core.validators.MaxValueValidator(90)]),
+        ),
+        migrations.AddField(
+            model_name='ride',
+            name='arrival_longitude',
+            field=models.FloatField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(-180), django.core.validators.MaxValueValidator(180)]),
+        ),
+        migrations.AddField(
+            model_name='ride',
+            name='departure_geohash',
+            field=models.CharField(blank=True, db_index=True, editable=False, help_text='Geohash of the departure coordinates, used for proximity searches.', max_length=12),
+        ),
+        migrations.AddField(
+            model_name='ride',
+            name='departure_latitude',
+            field=models.FloatField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(-90), django.core.validators.MaxValueValidator(90)]),
+        ),
+        migrations.AddField(
+            model_name='ride',
+            name='departure_longitude',
+            field=models.FloatField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(-180), django.core.validators.MaxValueValidator(180)]),
+        ),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 3.2.25 on 2026-10-18 19:52
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+from cride.rides.managers.search import RideSearchTermManager
+
+TRIGRAM_INDEXES = {
+    'rides_ride_departure_location_trgm': 'departure_location',
+    'rides_ride_arrival_location_trgm': 'arrival_location',
+}
+
+
+def create_search_indexes(apps, schema_editor):
+    """Create trigram indexes on PostgreSQL, index the terms elsewhere."""
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        for name, column in TRIGRAM_INDEXES.items():
+            schema_editor.execute(
+                'CREATE INDEX IF NOT EXISTS {} ON rides_ride USING gin '
+                '(UPPER({}::text) gin_trgm_ops)'.format(name, column)
+            )
+        return
+
+    Ride = apps.get_model('rides', 'Ride')
+    RideSearchTerm = apps.get_model('rides', 'RideSearchTerm')
+    manager = RideSearchTermManager()
+    terms = []
+    for ride in Ride.objects.only(*manager.INDEXED_FIELDS).iterator():
+        words = set()
+        for field in manager.INDEXED_FIELDS:
+            words.update(manager.tokenize(getattr(ride, field)))
+        terms.extend(RideSearchTerm(ride=ride, term=word) for word in words)
+    RideSearchTerm.objects.bulk_create(terms, batch_size=1000)
+
+
+def drop_search_indexes(apps, schema_editor):
+    """Drop the trigram indexes."""
+    if schema_editor.connection.vendor == 'postgresql':
+        for name in TRIGRAM_INDEXES:
+            schema_editor.execute('DROP INDEX IF EXISTS {}'.format(name))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rides', '0005_ride_coordinates'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RideSearchTerm',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(auto_now=True, help_text='Date time on which the object was created', verbose_name='created_at')),
+                ('modified', models.DateTimeField(auto_now_add=True, help_text='Date time on which the object was last modified', verbose_name='modified_at')),
+                ('term', models.CharField(max_length=64)),
+                ('ride', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_terms', to='rides.ride')),
+            ],
+            options={
+                'ordering': ['-created', '-modified'],
+                'get_latest_by': 'created',
+                'abstract': False,
+            },
+        ),
+        migrations.AddIndex(
+            model_name='ridesearchterm',
+            index=models.Index(fields=['term', 'ride'], name='rides_search_term_idx'),
+        ),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 3.2.25 on 2026-10-18 19:54
+
+from django.db import migrations, models
+from django.db.models import Count, FloatField, IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def backfill_rating_aggregates(apps, schema_editor):
+    """Compute the rating aggregates of the existing rides and profiles."""
+    Rating = apps.get_model('rides', 'Rating')
+    Ride = apps.get_model('rides', 'Ride')
+    Profile = apps.get_model('users', 'Profile')
+
+    for model, lookup, ref in ((Ride, 'ride', 'pk'), (Profile, 'rated_user', 'user')):
+        ratings = Rating.objects.filter(**{lookup: OuterRef(ref)}).order_by().values(lookup)
+        model.objects.update(
+            rating_sum=Coalesce(
+                Subquery(ratings.annotate(total=Sum('rating')).values('total'), output_field=FloatField()),
+                0.0
+            ),
+            rating_count=Coalesce(
+                Subquery(ratings.annotate(total=Count('pk')).values('total'), output_field=IntegerField()),
+                0
+            ),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rides', '0006_ride_search'),
+        ('users', '0002_profile_rating_aggregates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ride',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0, help_text='Number of ratings received, used to maintain the rating.'),
+        ),
+        migrations.AddField(
+            model_name='ride',
+            name='rating_sum',
+            field=models.FloatField(default=0, help_text='Sum of the ratings received, used to maintain the rating.'),
+        ),
+        migrations.RunPython(backfill_rating_aggregates, migrations.RunPython.noop),
+    ]
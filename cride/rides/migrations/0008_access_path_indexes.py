@@ -0,0 +1,37 @@
+# Generated by Django 3.2.25 on 2026-10-18 19:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rides', '0007_ride_rating_aggregates'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='rating',
+            options={'get_latest_by': 'created'},
+        ),
+        migrations.AlterModelOptions(
+            name='ride',
+            options={'get_latest_by': 'created'},
+        ),
+        migrations.AlterModelOptions(
+            name='ridesearchterm',
+            options={'get_latest_by': 'created'},
+        ),
+        migrations.AddIndex(
+            model_name='rating',
+            index=models.Index(fields=['ride', 'rating_user'], name='rides_rating_ride_user_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ride',
+            index=models.Index(condition=models.Q(('available_seats__gte', 1), ('is_active', True)), fields=['offered_in', 'departure_date', 'arrival_date'], name='rides_ride_listing_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ride',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['arrival_date'], name='rides_ride_active_arrival_idx'),
+        ),
+    ]
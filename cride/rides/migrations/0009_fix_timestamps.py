@@ -0,0 +1,52 @@
+# Generated by Django 3.2.25 on 2026-10-18 20:11
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def swap_timestamps(apps, schema_editor):
+    """Swap the creation and modification dates saved with the fields mixed up."""
+    for name in ['Rating', 'Ride', 'RideSearchTerm']:
+        model = apps.get_model('rides', name)
+        model.objects.update(created=F('modified'), modified=F('created'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rides', '0008_access_path_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(swap_timestamps, swap_timestamps),
+        migrations.AlterField(
+            model_name='rating',
+            name='created',
+            field=models.DateTimeField(auto_now_add=True, help_text='Date time on which the object was created', verbose_name='created_at'),
+        ),
+        migrations.AlterField(
+            model_name='rating',
+            name='modified',
+            field=models.DateTimeField(auto_now=True, help_text='Date time on which the object was last modified', verbose_name='modified_at'),
+        ),
+        migrations.AlterField(
+            model_name='ride',
+            name='created',
+            field=models.DateTimeField(auto_now_add=True, help_text='Date time on which the object was created', verbose_name='created_at'),
+        ),
+        migrations.AlterField(
+            model_name='ride',
+            name='modified',
+            field=models.DateTimeField(auto_now=True, help_text='Date time on which the object was last modified', verbose_name='modified_at'),
+        ),
+        migrations.AlterField(
+            model_name='ridesearchterm',
+            name='created',
+            field=models.DateTimeField(auto_now_add=True, help_text='Date time on which the object was created', verbose_name='created_at'),
+        ),
+        migrations.AlterField(
+            model_name='ridesearchterm',
+            name='modified',
+            field=models.DateTimeField(auto_now=True, help_text='Date time on which the object was last modified', verbose_name='modified_at'),
+        ),
+    ]
@@ -50,3 +50,11 @@ class Rating(CRideModel):
             self.rating,
             self.rated_user.username,
         )
+
+    class Meta(CRideModel.Meta):
+        """Meta class."""
+
+        indexes = [
+            # Duplicated rating check
+            models.Index(fields=['ride', 'rating_user'], name='rides_rating_ride_user_idx'),
+        ]
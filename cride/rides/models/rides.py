@@ -1,9 +1,11 @@
 """Ride Model."""
 
 # Django
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 
 # Utilities
+from cride.utils.geo import encode_geohash
 from cride.utils.models import CRideModel
 
 
@@ -22,11 +24,53 @@ class Ride(CRideModel):
 
     departure_location = models.CharField(max_length=255)
     departure_date = models.DateTimeField()
+    departure_latitude = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(-90), MaxValueValidator(90)]
+    )
+    departure_longitude = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(-180), MaxValueValidator(180)]
+    )
+    departure_geohash = models.CharField(
+        max_length=12,
+        blank=True,
+        db_index=True,
+        editable=False,
+        help_text='Geohash of the departure coordinates, used for proximity searches.'
+    )
 
     arrival_location = models.CharField(max_length=255)
     arrival_date = models.DateTimeField()
+    arrival_latitude = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(-90), MaxValueValidator(90)]
+    )
+    arrival_longitude = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(-180), MaxValueValidator(180)]
+    )
+    arrival_geohash = models.CharField(
+        max_length=12,
+        blank=True,
+        db_index=True,
+        editable=False,
+        help_text='Geohash of the arrival coordinates, used for proximity searches.'
+    )
 
     rating = models.FloatField(null=True)
+    rating_sum = models.FloatField(
+        default=0,
+        help_text='Sum of the ratings received, used to maintain the rating.'
+    )
+    rating_count = models.PositiveIntegerField(
+        default=0,
+        help_text='Number of ratings received, used to maintain the rating.'
+    )
 
     is_active = models.BooleanField(
         'active_status',
@@ -34,6 +78,21 @@ class Ride(CRideModel):
         help_text="Used for disabling the ride or marking it as finished "
     )
 
+    def update_geohashes(self):
+        """Compute the geohashes of the departure and arrival coordinates."""
+        for point in ('departure', 'arrival'):
+            latitude = getattr(self, '{}_latitude'.format(point))
+            longitude = getattr(self, '{}_longitude'.format(point))
+            geohash = ''
+            if latitude is not None and longitude is not None:
+                geohash = encode_geohash(latitude, longitude)
+            setattr(self, '{}_geohash'.format(point), geohash)
+
+    def save(self, *args, **kwargs):
+        """Keep the geohashes in sync with the coordinates."""
+        self.update_geohashes()
+        super(Ride, self).save(*args, **kwargs)
+
     def __str__(self):
         """Return the rides details."""
         return "{_from} to {to} | {day} {i_time} - {f_time}".format(
@@ -43,3 +102,21 @@ class Ride(CRideModel):
             i_time=self.departure_date.strftime('%I:%M %p'),
             f_time=self.arrival_date.strftime('%I:%M %p'),
         )
+
+    class Meta(CRideModel.Meta):
+        """Meta class."""
+
+        indexes = [
+            # Circle's rides listing
+            models.Index(
+                fields=['offered_in', 'departure_date', 'arrival_date'],
+                condition=models.Q(is_active=True, available_seats__gte=1),
+                name='rides_ride_listing_idx'
+            ),
+            # Finished rides sweep
+            models.Index(
+                fields=['arrival_date'],
+                condition=models.Q(is_active=True),
+                name='rides_ride_active_arrival_idx'
+            ),
+        ]
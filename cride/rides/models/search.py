@@ -0,0 +1,40 @@
+"""Ride Search Term Model."""
+
+# Django
+from django.db import models
+
+# Managers
+from cride.rides.managers import RideSearchTermManager
+
+# Utilities
+from cride.utils.models import CRideModel
+
+
+class RideSearchTerm(CRideModel):
+    """Ride Search Term Model.
+
+    Holds every word of a ride's departure and arrival locations so
+    databases without trigram indexes can still answer the ride search
+    with indexed prefix lookups instead of substring scans.
+    """
+
+    ride = models.ForeignKey(
+        'rides.Ride',
+        on_delete=models.CASCADE,
+        related_name='search_terms'
+    )
+    term = models.CharField(max_length=64)
+
+    # Manager
+    objects = RideSearchTermManager()
+
+    def __str__(self):
+        """Return ride and term."""
+        return '{}: {}'.format(self.ride_id, self.term)
+
+    class Meta(CRideModel.Meta):
+        """Meta class."""
+
+        indexes = [
+            models.Index(fields=['term', 'ride'], name='rides_search_term_idx'),
+        ]
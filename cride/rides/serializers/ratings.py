@@ -4,10 +4,13 @@
 from rest_framework import serializers
 
 # Models
-from cride.rides.models import Rating
+from cride.rides.models import Rating, Ride
+from cride.users.models import Profile
 
 # Utilities
-from django.db.models import Avg
+from cride.utils.counters import running_average
+from django.db.models import F
+from django.utils import timezone
 
 
 class RateRideSerializer(serializers.ModelSerializer):
@@ -49,29 +52,23 @@ class RateRideSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError('The ride has already been rated.')
         return data
 
+    def add_rating(self, queryset, field, value):
+        """Add a rating to the running aggregates and refresh the average."""
+        queryset.update(**{
+            'rating_sum': F('rating_sum') + value,
+            'rating_count': F('rating_count') + 1,
+            field: running_average(F('rating_sum') + value, F('rating_count') + 1),
+            'modified': timezone.now(),
+        })
+
     def create(self, data):
         """Create Rating and update rating in the ride."""
-        ride = data['ride']
         rating = Rating.objects.create(**data)
 
         # Ride
-        ride.rating = round(
-            Rating.objects.filter(
-                circle=ride.offered_in,
-                ride=ride
-            ).aggregate(Avg('rating'))['rating__avg'],
-            1
-        )
-        ride.save()
+        self.add_rating(Ride.objects.filter(pk=data['ride'].pk), 'rating', data['rating'])
 
         # Rated User
-        rated_user = data['rated_user']
-        rated_user.profile.reputation = round(
-            Rating.objects.filter(
-                rated_user=rated_user
-            ).aggregate(Avg('rating'))['rating__avg'],
-            1
-        )
-        rated_user.profile.save()
+        self.add_rating(Profile.objects.filter(user=data['rated_user']), 'reputation', data['rating'])
 
         return rating
@@ -5,14 +5,19 @@ from rest_framework import serializers
 
 # Models
 from cride.rides.models import Ride
-from cride.circles.models import Membership
-from cride.users.models import User
+from cride.circles.models import CircleStatDelta, Membership
+from cride.users.models import Profile, User
 
 # Serializers
 from cride.users.serializers import UserModelSerializer
 
+# Cache
+from cride.circles.cache import get_membership
+
 # Utilities
+from cride.utils.counters import increment
 from datetime import timedelta
+from django.db.models import F
 from django.utils import timezone
 
 
@@ -26,6 +31,8 @@ class RideModelSerializer(serializers.ModelSerializer):
 
     available_seats = serializers.IntegerField(min_value=1, max_value=10)
 
+    distance = serializers.SerializerMethodField()
+
     class Meta:
         """Meta class."""
         model = Ride
@@ -34,8 +41,15 @@ class RideModelSerializer(serializers.ModelSerializer):
             'offered_by',
             'offered_in',
             'rating',
+            'rating_sum',
+            'rating_count',
         ]
 
+    def get_distance(self, obj):
+        """Return the distance in km to the searched point, if any."""
+        distance = getattr(obj, 'distance', None)
+        return round(distance, 3) if distance is not None else None
+
     def update(self, instance, validated_data):
         """Allow updates only before departure time."""
         now = timezone.now()
@@ -57,6 +71,8 @@ class CreateRideSerializer(serializers.ModelSerializer):
             'offered_in',
             'passengers',
             'rating',
+            'rating_sum',
+            'rating_count',
             'is_active',
         ]
 
@@ -77,15 +93,22 @@ class CreateRideSerializer(serializers.ModelSerializer):
         """
         user = data['offered_by']
         circle = self.context['circle']
-        try:
-            membership = Membership.objects.get(user=user, circle=circle, is_active=True)
-            self.context['membership'] = membership
-        except Membership.DoesNotExist:
+        membership = get_membership(user, circle, self.context.get('request'))
+        if membership is None:
             raise serializers.ValidationError('User is not an active member of the circle.')
+        self.context['membership'] = membership
 
         if data['arrival_date'] < data['departure_date']:
             raise serializers.ValidationError('Arrival time has to happen after the departure.')
 
+        for point in ('departure', 'arrival'):
+            latitude = data.get('{}_latitude'.format(point))
+            longitude = data.get('{}_longitude'.format(point))
+            if (latitude is None) != (longitude is None):
+                raise serializers.ValidationError(
+                    'Both {point}_latitude and {point}_longitude must be provided.'.format(point=point)
+                )
+
         return data
 
     def create(self, validated_data):
@@ -94,18 +117,14 @@ class CreateRideSerializer(serializers.ModelSerializer):
         ride = Ride.objects.create(**validated_data, offered_in=circle)
 
         # Circle
-        circle.rides_offered += 1
-        circle.save()
+        CircleStatDelta.objects.record(circle, rides_offered=1)
 
         # Membership
         membership = self.context['membership']
-        membership.rides_offered += 1
-        membership.save()
+        increment(Membership.objects.filter(pk=membership.pk), rides_offered=1)
 
         # Profile
-        profile = validated_data['offered_by'].profile
-        profile.rides_offered += 1
-        profile.save()
+        increment(Profile.objects.filter(user=validated_data['offered_by']), rides_offered=1)
 
         return ride
 
@@ -128,14 +147,10 @@ class JoinRideSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError('User does not exists.')
 
         circle = self.context['circle']
-        try:
-            self.context['member'] = Membership.objects.get(
-                circle=circle,
-                user=user,
-                is_active=True
-            )
-        except Membership.DoesNotExist:
+        member = get_membership(user, circle, self.context.get('request'))
+        if member is None:
             raise serializers.ValidationError('User does not belong to the circle.')
+        self.context['member'] = member
 
         self.context['user'] = user
 
@@ -159,28 +174,32 @@ class JoinRideSerializer(serializers.ModelSerializer):
         return data
 
     def update(self, ride, _):
-        """Add passenger to ride and update Stats."""
+        """Add passenger to ride and update Stats.
+
+        The seat is taken with a conditional update, so the database
+        refuses it once the ride is full even under concurrent joins.
+        """
         user = self.context['user']
 
         # Ride
+        reserved = Ride.objects.filter(pk=ride.pk, available_seats__gte=1).update(
+            available_seats=F('available_seats') - 1,
+            modified=timezone.now()
+        )
+        if not reserved:
+            raise serializers.ValidationError('There is no room in this ride.')
         ride.passengers.add(user)
-        ride.available_seats -= 1
-        ride.save()
+        ride.refresh_from_db(fields=['available_seats', 'modified'])
 
         # Profile
-        profile = user.profile
-        profile.rides_taken += 1
-        profile.save()
+        increment(Profile.objects.filter(user=user), rides_taken=1)
 
         # Membership
         member = self.context['member']
-        member.rides_taken += 1
-        member.save()
+        increment(Membership.objects.filter(pk=member.pk), rides_taken=1)
 
         # Circle
-        circle = self.context['circle']
-        circle.rides_taken += 1
-        circle.save()
+        CircleStatDelta.objects.record(self.context['circle'], rides_taken=1)
 
         return ride
 
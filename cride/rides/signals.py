@@ -0,0 +1,40 @@
+"""Rides Signals."""
+
+# Django
+from django.db import connection
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+# Models
+from cride.rides.models import Ride, RideSearchTerm
+
+# Cache
+from cride.rides.cache import invalidate_rides
+
+
+@receiver(post_save, sender=Ride)
+def index_ride_search_terms(sender, instance, update_fields=None, **kwargs):
+    """Keep the search terms of the ride locations up to date.
+
+    PostgreSQL answers the search with trigram indexes, so the
+    terms table is only maintained for the other backends.
+    """
+    if connection.vendor == 'postgresql':
+        return
+    if update_fields and not set(update_fields) & set(RideSearchTerm.objects.INDEXED_FIELDS):
+        return
+    RideSearchTerm.objects.index(instance)
+
+
+@receiver(post_save, sender=Ride)
+@receiver(post_delete, sender=Ride)
+def invalidate_circle_rides(sender, instance, **kwargs):
+    """Change the circle's rides version when one of them changes."""
+    invalidate_rides(instance.offered_in_id)
+
+
+@receiver(m2m_changed, sender=Ride.passengers.through)
+def invalidate_ride_passengers(sender, instance, action, reverse, **kwargs):
+    """Change the circle's rides version when passengers join a ride."""
+    if action.startswith('post_') and not reverse:
+        invalidate_rides(instance.offered_in_id)
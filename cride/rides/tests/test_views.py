@@ -0,0 +1,125 @@
+"""Rides views tests."""
+
+# Django
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+# Django REST Framework
+from rest_framework.test import APIClient
+
+# Models
+from cride.circles.models import Circle, Membership
+from cride.rides.models import Ride
+from cride.users.models import Profile, User
+
+# Utilities
+from datetime import timedelta
+import pytest
+
+
+pytestmark = pytest.mark.django_db
+
+# Queries of a ride detail request, whatever the number of passengers:
+# circle, membership, ride, passengers and the savepoint of the atomic
+# request. Lists also check their version with an aggregate query.
+QUERY_BUDGET = 6
+LIST_QUERY_BUDGET = QUERY_BUDGET + 1
+
+
+def create_member(circle, username, is_admin=False):
+    """Create a verified user member of the circle."""
+    user = User.objects.create_user(
+        email='{}@cride.test'.format(username),
+        username=username,
+        password='cride-test-password',
+        first_name='Test',
+        last_name='User',
+        is_verified=True,
+    )
+    profile = Profile.objects.create(user=user)
+    Membership.objects.create(user=user, profile=profile, circle=circle, is_admin=is_admin)
+    return user
+
+
+def create_rides(circle, drivers, passengers, count):
+    """Create upcoming rides offered by the drivers, joined by every passenger."""
+    departure = timezone.now() + timedelta(hours=1)
+    for index in range(count):
+        ride = Ride.objects.create(
+            offered_by=drivers[index % len(drivers)],
+            offered_in=circle,
+            available_seats=3,
+            departure_location='Centro {}'.format(index),
+            departure_date=departure + timedelta(minutes=index),
+            arrival_location='Universidad',
+            arrival_date=departure + timedelta(hours=1),
+        )
+        ride.passengers.add(*passengers)
+
+
+@pytest.fixture
+def circle():
+    """Circle the rides are offered in."""
+    return Circle.objects.create(name='Test', slug_name='test')
+
+
+@pytest.fixture
+def members(circle):
+    """Members of the circle, the first one is its admin."""
+    return [create_member(circle, 'member{}'.format(index), is_admin=index == 0) for index in range(6)]
+
+
+@pytest.fixture
+def api_client(members):
+    """Client authenticated as the circle admin."""
+    client = APIClient()
+    client.force_authenticate(user=members[0])
+    return client
+
+
+def count_queries(client, url):
+    """Request a url and return the number of queries it issued.
+
+    The cache is cleared first, so the circle and membership are
+    always fetched.
+    """
+    cache.clear()
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200
+    return len(context.captured_queries)
+
+
+def test_ride_list_queries_are_bounded(circle, members, api_client):
+    url = reverse('rides:ride-list', kwargs={'slug_name': circle.slug_name})
+    create_rides(circle, members[:2], members[2:], 2)
+    few = count_queries(api_client, url)
+
+    create_rides(circle, members[:2], members[2:], 8)
+    many = count_queries(api_client, url)
+
+    assert few <= LIST_QUERY_BUDGET
+    assert many == few
+
+
+def test_ride_detail_queries_are_bounded(circle, members, api_client):
+    create_rides(circle, members[:2], members[2:], 3)
+    ride = Ride.objects.order_by('pk').last()
+    url = reverse('rides:ride-detail', kwargs={'slug_name': circle.slug_name, 'pk': ride.pk})
+    assert count_queries(api_client, url) <= QUERY_BUDGET
+
+
+def test_ride_etag_follows_embedded_users(circle, members, api_client):
+    create_rides(circle, members[:1], members[2:], 1)
+    ride = Ride.objects.get()
+    url = reverse('rides:ride-detail', kwargs={'slug_name': circle.slug_name, 'pk': ride.pk})
+    etag = api_client.get(url)['ETag']
+    assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    Profile.objects.filter(user=members[2]).update(reputation=4.5, modified=timezone.now())
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response['ETag'] != etag
@@ -3,7 +3,6 @@
 
 # Django REST Framework
 from rest_framework import mixins, viewsets, status
-from rest_framework.generics import get_object_or_404
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
@@ -22,45 +21,82 @@ from cride.rides.serializers import (
 )
 
 # Filtes
-from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.filters import OrderingFilter
+from cride.rides.filters import RideProximityFilter, RideSearchFilter
+
+# Views
+from cride.circles.views.mixins import CircleNestedViewMixin
+from cride.utils.views import ConditionalGetMixin, StreamingListMixin
 
 # Models
-from cride.circles.models import Circle
+from cride.users.models import User
+
+# Cache
+from cride.rides.cache import get_rides_version
 
 # Utilities
 from datetime import timedelta
+from django.db.models import Count, Max, Prefetch, prefetch_related_objects
 from django.utils import timezone
 
 
-class RideViewset(mixins.ListModelMixin,
+class RideViewset(CircleNestedViewMixin,
+                  StreamingListMixin,
+                  ConditionalGetMixin,
+                  mixins.ListModelMixin,
                   mixins.RetrieveModelMixin,
                   mixins.CreateModelMixin,
                   mixins.UpdateModelMixin,
                   viewsets.GenericViewSet):
     """Ride View set."""
 
-    filter_backends = [SearchFilter, OrderingFilter]
+    filter_backends = [OrderingFilter, RideSearchFilter, RideProximityFilter]
     search_fields = ['departure_location', 'arrival_location']
     ordering = ['departure_date', 'arrival_date', '-available_seats']
     ordering_fields = ['departure_date', 'arrival_date', 'available_seats']
 
-    def dispatch(self, request, *args, **kwargs):
-        """Verifies that the circle exists."""
-        slug_name = kwargs['slug_name']
-        self.circle = get_object_or_404(Circle, slug_name=slug_name)
-        return super(RideViewset, self).dispatch(request, *args, **kwargs)
+    passengers_prefetch = Prefetch('passengers', queryset=User.objects.select_related('profile'))
 
     def get_queryset(self):
-        """Return active circle's Rides."""
+        """Return active circle's Rides.
+
+        Related users and profiles are fetched upfront so serializing
+        rides costs a fixed number of queries.
+        """
+        queryset = self.circle.ride_set.select_related(
+            'offered_by__profile',
+            'offered_in',
+        ).prefetch_related(self.passengers_prefetch)
+
         if self.action in ['finish', 'rate']:
-            return self.circle.ride_set.all()
+            return queryset
         offset = timezone.now() + timedelta(minutes=10)
-        return self.circle.ride_set.filter(
+        return queryset.filter(
             departure_date__gte=offset,
             available_seats__gte=1,
             is_active=True
         )
 
+    def get_list_version(self):
+        """Return the circle's rides version along with the last change of their users.
+
+        Rides also leave the list as their departure gets close, which
+        changes their count. Checked with a single query.
+        """
+        rides = self.filter_queryset(self.get_queryset()).aggregate(
+            count=Count('pk', distinct=True),
+            drivers=Max('offered_by__modified'),
+            driver_profiles=Max('offered_by__profile__modified'),
+            riders=Max('passengers__modified'),
+            rider_profiles=Max('passengers__profile__modified'),
+        )
+        return '{}:{}'.format(get_rides_version(self.circle.pk), sorted(rides.items()))
+
+    def get_object_stamps(self, instance):
+        """Return the ride's timestamp and the ones of its embedded users."""
+        users = [instance.offered_by] + list(instance.passengers.all())
+        return [instance.modified] + [user.modified for user in users] + [user.profile.modified for user in users]
+
     def get_permissions(self):
         """Return permissions based on the performing acton."""
         permissions = [IsAuthenticated, IsActiveCircleMember]
@@ -101,6 +137,7 @@ class RideViewset(mixins.ListModelMixin,
         )
         serializer.is_valid(raise_exception=True)
         ride = serializer.save()
+        prefetch_related_objects([ride], self.passengers_prefetch)
 
         data = RideModelSerializer(ride).data
         return Response(data, status=status.HTTP_200_OK)
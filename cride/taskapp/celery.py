@@ -26,3 +26,4 @@ class CeleryAppConfig(AppConfig):
     def ready(self):
         installed_apps = [app_config.name for app_config in apps.get_app_configs()]
         app.autodiscover_tasks(lambda: installed_apps, force=True)
+        import cride.taskapp.signals  # NOQA
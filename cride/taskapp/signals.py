@@ -0,0 +1,82 @@
+"""Celery signals."""
+
+# Django
+from django.conf import settings
+
+# Celery
+from celery.signals import (
+    before_task_publish,
+    task_postrun,
+    task_prerun,
+    worker_process_shutdown,
+    worker_ready,
+)
+from celery.utils.time import maybe_iso8601, maybe_make_aware
+
+# Metrics
+from cride.utils.metrics import TASK_QUEUE_WAIT, TASK_RUNTIME, get_registry
+
+# Utilities
+from prometheus_client import multiprocess, start_http_server
+import os
+import time
+
+
+PUBLISHED_AT_HEADER = 'published_at'
+
+# Start time of the running tasks, by task id.
+_started = {}
+
+
+@before_task_publish.connect
+def stamp_publication(headers=None, **kwargs):
+    """Stamp the messages with their publication time."""
+    if headers is not None:
+        headers[PUBLISHED_AT_HEADER] = time.time()
+
+
+def get_ready_at(request):
+    """Return the time a task could start: its publication or its eta if later."""
+    ready_at = getattr(request, PUBLISHED_AT_HEADER, None) or \
+        (request.headers or {}).get(PUBLISHED_AT_HEADER)
+    eta = maybe_iso8601(request.eta)
+    if eta is not None:
+        eta = maybe_make_aware(eta).timestamp()
+        ready_at = max(ready_at or eta, eta)
+    return ready_at
+
+
+@task_prerun.connect
+def record_start(task_id=None, task=None, **kwargs):
+    """Record the time a task waited in the queue and its start.
+
+    Tasks scheduled with an eta or a countdown, retries included, only
+    wait from the time they were due.
+    """
+    ready_at = get_ready_at(task.request)
+    if ready_at is not None:
+        retried = 'true' if task.request.retries else 'false'
+        TASK_QUEUE_WAIT.labels(task=task.name, retried=retried).observe(max(time.time() - ready_at, 0))
+    _started[task_id] = time.perf_counter()
+
+
+@task_postrun.connect
+def record_runtime(task_id=None, task=None, state=None, **kwargs):
+    """Record the runtime of a task."""
+    start = _started.pop(task_id, None)
+    if start is not None:
+        TASK_RUNTIME.labels(task=task.name, state=state or 'UNKNOWN').observe(time.perf_counter() - start)
+
+
+@worker_ready.connect
+def serve_metrics(**kwargs):
+    """Export the metrics of the worker processes on METRICS_WORKER_PORT."""
+    if settings.METRICS_WORKER_PORT:
+        start_http_server(settings.METRICS_WORKER_PORT, registry=get_registry())
+
+
+@worker_process_shutdown.connect
+def discard_process_metrics(pid=None, **kwargs):
+    """Discard the live metrics files of exited pool processes."""
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        multiprocess.mark_process_dead(pid or os.getpid())
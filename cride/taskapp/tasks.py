@@ -2,13 +2,18 @@
 
 # Django
 from django.conf import settings
-from django.template.loader import render_to_string
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import OperationalError, transaction
+from django.template.loader import get_template
 from django.utils import timezone
-from django.core.mail import EmailMultiAlternatives
 
 # Models
 from cride.users.models import User
 from cride.rides.models import Ride
+from cride.circles.models import CircleStatDelta
+
+# Cache
+from cride.circles.cache import invalidate_directory
 
 # Celery
 from celery.decorators import task, periodic_task
@@ -16,32 +21,69 @@ from celery.decorators import task, periodic_task
 # Utilities
 import jwt
 from datetime import timedelta
-from time import sleep
 
 
-@task(name='send_confirmation_email', max_retries=3)
-def send_confirmation_email(user_pk):
-    """Send account verification link to given user."""
-    for i in range(10):
-        sleep(1)
-        print(f"Sleeping.......{i+1}......")
-    user = User.objects.get(pk=user_pk)
-    verification_token = gen_verification_token(user_pk=user.pk)
+EMAIL_BATCH_SIZE = 100
+EMAIL_RETRY_DELAY = 30
+
+
+@task(name='send_confirmation_email', bind=True, max_retries=5)
+def send_confirmation_email(self, user_pk=None):
+    """Send the queued account verification emails.
+
+    Unverified users whose email wasn't sent yet are drained in batches,
+    each one sent over a single connection to the email backend. Failed
+    batches are left queued and retried with an exponential backoff.
+    Concurrent runs skip the batches locked by each other.
+
+    user_pk is accepted for the messages queued by previous releases,
+    the user is sent its email with the rest of the queue.
+    """
+    try:
+        while send_verification_batch(EMAIL_BATCH_SIZE) == EMAIL_BATCH_SIZE:
+            pass
+    except Exception as exc:
+        raise self.retry(exc=exc, countdown=EMAIL_RETRY_DELAY * 2 ** self.request.retries)
+
+
+def send_verification_batch(size):
+    """Send a batch of queued verification emails and return its size.
+
+    Users are marked in the transaction locking them, so a failed batch
+    stays queued, although the emails sent before the failure will be
+    sent again.
+    """
+    with transaction.atomic():
+        users = list(
+            User.objects.select_for_update(skip_locked=True).filter(
+                is_verified=False,
+                verification_sent_at__isnull=True
+            ).order_by('created')[:size]
+        )
+        if not users:
+            return 0
+
+        template = get_template('emails/users/account_verification.html')
+        messages = [build_verification_email(user, template) for user in users]
+        with get_connection() as connection:
+            connection.send_messages(messages)
+
+        User.objects.filter(pk__in=[user.pk for user in users]).update(verification_sent_at=timezone.now())
+    return len(users)
+
 
+def build_verification_email(user, template):
+    """Return the account verification email of a user."""
     subject = "Welcome @{}! Verify your account to start using Comparte Ride.".format(user.username)
     from_email = 'Comparte Ride <noreply@comparteride.com>'
-    content = render_to_string(
-        'emails/users/account_verification.html',
-        {'token': verification_token, 'user': user}
-    )
+    content = template.render({'token': gen_verification_token(user), 'user': user})
     msg = EmailMultiAlternatives(subject, content, from_email, [user.email])
     msg.attach_alternative(content, "text/html")
-    msg.send()
+    return msg
 
 
-def gen_verification_token(user_pk):
+def gen_verification_token(user):
     """Create the JWT token that the user can use to verify their account."""
-    user = User.objects.get(pk=user_pk)
     exp_date = timezone.now() + timedelta(days=3)
     payload = {
         'username': user.username,
@@ -51,16 +93,58 @@ def gen_verification_token(user_pk):
     return jwt.encode(payload, settings.SECRET_KEY, algorithm='HS256')
 
 
-@periodic_task(name='disable_finished_rides', run_every=timedelta(seconds=10))
+RIDE_EXPIRY_INTERVAL = timedelta(minutes=5)
+RIDE_CLOSE_RETRY_DELAY = 10
+
+
+@task(name='close_ride', bind=True, max_retries=3)
+def close_ride(self, ride_pk):
+    """Disable a ride once it has arrived.
+
+    Transient database errors are retried, rides still missed are
+    closed by the next disable_finished_rides run.
+    """
+    try:
+        Ride.objects.filter(
+            pk=ride_pk,
+            is_active=True,
+            arrival_date__lte=timezone.now()
+        ).update(is_active=False, modified=timezone.now())
+    except OperationalError as exc:
+        raise self.retry(exc=exc, countdown=RIDE_CLOSE_RETRY_DELAY)
+
+
+@periodic_task(name='disable_finished_rides', run_every=RIDE_EXPIRY_INTERVAL)
 def disable_finished_rides():
-    """Disable Finished Rides."""
+    """Disable Finished Rides.
+
+    Close every ride that has already arrived, including the ones missed
+    while the scheduler was down, and schedule the rides arriving before
+    the next run to be closed exactly at their arrival time.
+    """
     now = timezone.now()
-    offset = now + timedelta(seconds=5)
 
     # Update rides that have already finish
-    rides = Ride.objects.filter(
+    Ride.objects.filter(
+        is_active=True,
+        arrival_date__lte=now
+    ).update(is_active=False, modified=now)
+
+    # Schedule rides finishing before the next run
+    upcoming = Ride.objects.filter(
         is_active=True,
-        arrival_date__gte=now,
-        arrival_date__lte=offset
-    )
-    rides.update(is_active=False)
+        arrival_date__gt=now,
+        arrival_date__lte=now + RIDE_EXPIRY_INTERVAL
+    ).values_list('pk', 'arrival_date')
+    for ride_pk, arrival_date in upcoming:
+        close_ride.apply_async(args=[ride_pk], eta=arrival_date)
+
+
+@periodic_task(name='fold_circle_stats', run_every=timedelta(minutes=1))
+def fold_circle_stats():
+    """Fold the pending circle stats deltas into the circles."""
+    folded = False
+    while CircleStatDelta.objects.fold():
+        folded = True
+    if folded:
+        invalidate_directory()
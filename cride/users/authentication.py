@@ -0,0 +1,132 @@
+"""Users authentication."""
+
+# Django
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.utils.translation import gettext_lazy as _
+
+# Django REST Framework
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+# Models
+from cride.users.models import User
+
+# Utilities
+from collections import OrderedDict
+from hashlib import sha256
+from threading import Lock
+from time import monotonic
+
+TOKEN_CACHE_TIMEOUT = 60 * 5
+
+LOCAL_TOKEN_CACHE_TIMEOUT = 30
+LOCAL_TOKEN_CACHE_SIZE = 1024
+
+
+class LocalTokenCache:
+    """Process local LRU of resolved tokens.
+
+    Entries expire after a short timeout to bound the memory they hold
+    on to, they are checked against the configured cache before use.
+    """
+
+    def __init__(self, size, timeout):
+        self.size = size
+        self.timeout = timeout
+        self.entries = OrderedDict()
+        self.lock = Lock()
+
+    def get(self, key):
+        """Return a resolved token or None if missing or expired."""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expires, token = entry
+            if expires < monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return token
+
+    def set(self, key, token):
+        """Store a resolved token evicting the least recently used."""
+        with self.lock:
+            self.entries[key] = (monotonic() + self.timeout, token)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+    def delete(self, key):
+        """Drop a resolved token."""
+        with self.lock:
+            self.entries.pop(key, None)
+
+
+local_token_cache = LocalTokenCache(LOCAL_TOKEN_CACHE_SIZE, LOCAL_TOKEN_CACHE_TIMEOUT)
+
+
+def token_cache_key(key):
+    """Return the cache key of a token without exposing it."""
+    return 'users:token:{}'.format(sha256(key.encode()).hexdigest())
+
+
+def user_version(user):
+    """Return the id and last modification of a user, as cached for its tokens."""
+    return (user.pk, user.modified)
+
+
+def prime_token(token):
+    """Store a token user in the caches.
+
+    The configured cache only holds the user id and version, the user
+    field values stay in the process local LRU.
+    """
+    version = user_version(token.user)
+    cache.set(token_cache_key(token.key), version, TOKEN_CACHE_TIMEOUT)
+    values = tuple(getattr(token.user, field.attname) for field in User._meta.concrete_fields)
+    local_token_cache.set(token.key, (version, values))
+
+
+def invalidate_token(key):
+    """Drop a token from the caches now and once the transaction commits."""
+    def delete():
+        cache.delete(token_cache_key(key))
+        local_token_cache.delete(key)
+
+    delete()
+    transaction.on_commit(delete)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """Token authentication resolving tokens from the caches.
+
+    The configured cache maps tokens to the id and version of their
+    user, and is dropped whenever the token or the user changes. Users
+    are built from the process local LRU while it holds the same
+    version, and read from the database otherwise. Every request gets
+    its own User and Token instances.
+    """
+
+    def authenticate_credentials(self, key):
+        """Return the user and token of the given key."""
+        version = cache.get(token_cache_key(key))
+        entry = local_token_cache.get(key)
+        if version is None or entry is None or entry[0] != version:
+            try:
+                token = Token.objects.select_related('user').get(key=key)
+            except Token.DoesNotExist:
+                local_token_cache.delete(key)
+                raise exceptions.AuthenticationFailed(_('Invalid token.'))
+            prime_token(token)
+        else:
+            field_names = [field.attname for field in User._meta.concrete_fields]
+            user = User.from_db(DEFAULT_DB_ALIAS, field_names, entry[1])
+            token = Token(key=key, user=user)
+
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+
+        return (token.user, token)
@@ -0,0 +1,23 @@
+# Generated by Django 3.2.25 on 2026-10-18 19:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0, help_text='Number of ratings received, used to maintain the reputation.'),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='rating_sum',
+            field=models.FloatField(default=0, help_text='Sum of the ratings received, used to maintain the reputation.'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 3.2.25 on 2026-10-18 19:59
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_profile_rating_aggregates'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='profile',
+            options={'get_latest_by': 'created'},
+        ),
+        migrations.AlterModelOptions(
+            name='user',
+            options={'get_latest_by': 'created'},
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 3.2.25 on 2026-10-18 20:11
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def swap_timestamps(apps, schema_editor):
+    """Swap the creation and modification dates saved with the fields mixed up."""
+    for name in ['Profile', 'User']:
+        model = apps.get_model('users', name)
+        model.objects.update(created=F('modified'), modified=F('created'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_remove_default_ordering'),
+    ]
+
+    operations = [
+        migrations.RunPython(swap_timestamps, swap_timestamps),
+        migrations.AlterField(
+            model_name='profile',
+            name='created',
+            field=models.DateTimeField(auto_now_add=True, help_text='Date time on which the object was created', verbose_name='created_at'),
+        ),
+        migrations.AlterField(
+            model_name='profile',
+            name='modified',
+            field=models.DateTimeField(auto_now=True, help_text='Date time on which the object was last modified', verbose_name='modified_at'),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='created',
+            field=models.DateTimeField(auto_now_add=True, help_text='Date time on which the object was created', verbose_name='created_at'),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='modified',
+            field=models.DateTimeField(auto_now=True, help_text='Date time on which the object was last modified', verbose_name='modified_at'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 3.2.25 on 2026-10-18 20:25
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def mark_sent(apps, schema_editor):
+    """Don't queue the existing users, their email was sent on signup."""
+    User = apps.get_model('users', 'User')
+    User.objects.update(verification_sent_at=F('created'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_fix_timestamps'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='verification_sent_at',
+            field=models.DateTimeField(blank=True, help_text='Date time on which the verification email was sent, unverified users without it are queued.', null=True),
+        ),
+        migrations.RunPython(mark_sent, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(condition=models.Q(('is_verified', False), ('verification_sent_at__isnull', True)), fields=['created'], name='users_user_unsent_idx'),
+        ),
+    ]
@@ -33,3 +33,11 @@ class Profile(CRideModel):
         default=5.0,
         help_text="User's reputation based on the rides offered and taken"
     )
+    rating_sum = models.FloatField(
+        default=0,
+        help_text='Sum of the ratings received, used to maintain the reputation.'
+    )
+    rating_count = models.PositiveIntegerField(
+        default=0,
+        help_text='Number of ratings received, used to maintain the reputation.'
+    )
@@ -46,6 +46,11 @@ class User(CRideModel, AbstractUser):
         default=False,
         help_text='Set to true when the user has verified his email.'
     )
+    verification_sent_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text='Date time on which the verification email was sent, unverified users without it are queued.'
+    )
 
     def __str__(self):
         """Return username"""
@@ -55,4 +60,16 @@ class User(CRideModel, AbstractUser):
         """Return username"""
         return self.username
 
+    class Meta(CRideModel.Meta):
+        """Meta class."""
+
+        indexes = [
+            # Verification emails queue
+            models.Index(
+                fields=['created'],
+                condition=models.Q(is_verified=False, verification_sent_at__isnull=True),
+                name='users_user_unsent_idx'
+            ),
+        ]
+
 
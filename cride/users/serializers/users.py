@@ -4,6 +4,7 @@
 from django.conf import settings
 from django.contrib.auth import password_validation, authenticate
 from django.core.validators import RegexValidator
+from django.db import transaction
 
 # Django REST framework
 from rest_framework import serializers
@@ -22,6 +23,9 @@ from cride.users.models import (User, Profile)
 # Tasks
 from cride.taskapp.tasks import send_confirmation_email
 
+# Authentication
+from cride.users.authentication import prime_token
+
 
 class UserModelSerializer(serializers.ModelSerializer):
     """User model serializer."""
@@ -93,6 +97,7 @@ class UserLoginSerializer(serializers.Serializer):
     def create(self, data):
         """Generate or retieve a token."""
         token, created = Token.objects.get_or_create(user=self.context['user'])
+        prime_token(token)
         return self.context['user'], token.key
 
 
@@ -139,5 +144,6 @@ class UserSignupSerializer(serializers.Serializer):
         data.pop('password_confirmation')
         user = User.objects.create_user(**data, is_verified=False, is_client=True)
         Profile.objects.create(user=user)
-        send_confirmation_email.delay(user_pk=user.pk)
+        # Queued by the unsent verification email, drained once committed.
+        transaction.on_commit(send_confirmation_email.delay)
         return user
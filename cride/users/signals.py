@@ -0,0 +1,29 @@
+"""Users Signals."""
+
+# Django
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+# Django REST Framework
+from rest_framework.authtoken.models import Token
+
+# Models
+from cride.users.models import User
+
+# Authentication
+from cride.users.authentication import invalidate_token
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_deleted_token(sender, instance, **kwargs):
+    """Drop the cached token when it is deleted."""
+    invalidate_token(instance.key)
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_tokens(sender, instance, created=False, **kwargs):
+    """Drop the cached tokens of a user when it changes."""
+    if created:
+        return
+    for key in Token.objects.filter(user=instance).values_list('key', flat=True):
+        invalidate_token(key)
@@ -0,0 +1,63 @@
+"""Users authentication tests."""
+
+# Django
+from django.core.cache import cache
+
+# Django REST Framework
+from rest_framework import exceptions
+from rest_framework.authtoken.models import Token
+
+# Models
+from cride.users.models import User
+
+# Authentication
+from cride.users.authentication import (
+    CachedTokenAuthentication,
+    local_token_cache,
+    prime_token,
+    token_cache_key,
+)
+
+# Utilities
+import pytest
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def token():
+    """Primed token of a user, as after a login."""
+    user = User.objects.create_user(
+        email='user@cride.test',
+        username='user',
+        password='cride-test-password',
+        first_name='Test',
+        last_name='User',
+    )
+    token = Token.objects.create(user=user)
+    prime_token(token)
+    yield token
+    local_token_cache.delete(token.key)
+
+
+def test_cached_tokens_hold_no_user_data(token):
+    assert cache.get(token_cache_key(token.key)) == (token.user.pk, token.user.modified)
+
+
+def test_requests_get_their_own_user(token, django_assert_num_queries):
+    authentication = CachedTokenAuthentication()
+    with django_assert_num_queries(0):
+        first, _ = authentication.authenticate_credentials(token.key)
+        second, _ = authentication.authenticate_credentials(token.key)
+    assert first == second == token.user
+    assert first is not second and first is not token.user
+
+
+def test_deactivated_users_are_rejected(token):
+    # Deactivated by another process, its local cache still holds the user.
+    User.objects.filter(pk=token.user.pk).update(is_active=False)
+    cache.delete(token_cache_key(token.key))
+
+    with pytest.raises(exceptions.AuthenticationFailed):
+        CachedTokenAuthentication().authenticate_credentials(token.key)
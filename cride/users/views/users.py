@@ -20,14 +20,18 @@ from cride.users.serializers import (
     AccountVerificationSerializer,
     ProfileModelSerializer,
 )
-from cride.circles.serializers.circles import CircleModelSerializer
+from cride.circles.serializers.circles import CircleModelSerializer, expands_members
 
 # Models
 from cride.users.models import User
 from cride.circles.models import Circle
 
+# Views
+from cride.utils.views import ConditionalGetMixin
 
-class UserViewSet(mixins.RetrieveModelMixin,
+
+class UserViewSet(ConditionalGetMixin,
+                  mixins.RetrieveModelMixin,
                   mixins.UpdateModelMixin,
                   viewsets.GenericViewSet):
     """User view set.
@@ -35,7 +39,7 @@ class UserViewSet(mixins.RetrieveModelMixin,
     Handle signup, login and account verification.
     """
 
-    queryset = User.objects.filter(is_client=True, is_verified=True)
+    queryset = User.objects.filter(is_client=True, is_verified=True).select_related('profile')
     serializer_class = UserModelSerializer
     lookup_field = 'username'
 
@@ -96,14 +100,36 @@ class UserViewSet(mixins.RetrieveModelMixin,
         return Response(data=data, status=status.HTTP_200_OK)
 
     def retrieve(self, request, *args, **kwargs):
-        response = super(UserViewSet, self).retrieve(request, *args, **kwargs)
-        circles = Circle.objects.filter(
+        """Return the user along with their circles.
+
+        Answered with 304 while neither the user, its profile nor its
+        circles changed. Pending circle stats change without touching
+        any modified timestamp, so no Last-Modified is sent.
+        """
+        user = self.get_object()
+        circles = Circle.objects.with_pending_stats().filter(
              members=request.user,
              membership__is_active=True
+        ).order_by('pk')
+        if expands_members(request):
+            circles = circles.with_members(CircleModelSerializer.MEMBERS_EXPAND_LIMIT)
+        circles = list(circles)
+
+        stamps = [user.modified, user.profile.modified]
+        for circle in circles:
+            stamps.append(circle.modified)
+            stamps += [membership.user.modified for membership in getattr(circle, 'expanded_memberships', [])]
+        pending = [(circle.pk, circle.pending_rides_offered, circle.pending_rides_taken) for circle in circles]
+
+        return self.get_conditional_response(
+            lambda: Response({
+                'user': self.get_serializer(user).data,
+                'circles': CircleModelSerializer(
+                    circles,
+                    many=True,
+                    read_only=True,
+                    context={'request': request}
+                ).data
+            }),
+            etag=self.get_etag((stamps, pending))
         )
-        data = {
-            'user': response.data,
-            'circles': CircleModelSerializer(circles, many=True, read_only=True).data
-        }
-        response.data = data
-        return response
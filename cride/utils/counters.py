@@ -0,0 +1,28 @@
+"""Counter utilities."""
+
+# Django
+from django.db.models import F
+from django.db.models.functions import Round
+from django.utils import timezone
+
+# Models
+from cride.utils.models import CRideModel
+
+
+def increment(queryset, **deltas):
+    """Atomically add the deltas to the counter columns of the queryset rows.
+
+    The addition happens in the database, so concurrent increments are
+    never lost and the rest of the row is left untouched but for the
+    modified timestamp of CRideModel rows.
+    """
+    updates = {field: F(field) + delta for field, delta in deltas.items()}
+    if issubclass(queryset.model, CRideModel):
+        updates['modified'] = timezone.now()
+    return queryset.update(**updates)
+
+
+def running_average(total, count, digits=1):
+    """Return an expression of total / count rounded to the given digits."""
+    scale = 10 ** digits
+    return Round(total * scale / count) / scale
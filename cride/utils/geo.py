@@ -0,0 +1,105 @@
+"""Geographic utilities.
+
+Rides are located by a geohash stored in an indexed column so proximity
+searches can be answered with prefix lookups on any database backend
+without requiring PostGIS.
+"""
+
+# Utilities
+from math import asin, cos, radians, sin, sqrt
+
+EARTH_RADIUS_KM = 6371.0088
+
+GEOHASH_PRECISION = 9
+GEOHASH_ALPHABET = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+# Approximate (height, width) in km of a geohash cell at the equator by precision.
+GEOHASH_CELL_SIZES = {
+    1: (4992.6, 5009.4),
+    2: (624.1, 1252.3),
+    3: (156.0, 156.5),
+    4: (19.5, 39.1),
+    5: (4.89, 4.89),
+    6: (0.61, 1.22),
+    7: (0.153, 0.153),
+    8: (0.019, 0.038),
+    9: (0.0048, 0.0048),
+}
+
+
+def encode_geohash(latitude, longitude, precision=GEOHASH_PRECISION):
+    """Return the geohash of a coordinate with the given precision."""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    geohash = []
+    bits, bit, even = 0, 0, True
+    while len(geohash) < precision:
+        if even:
+            middle = (lon_range[0] + lon_range[1]) / 2
+            if longitude >= middle:
+                bits = bits * 2 + 1
+                lon_range[0] = middle
+            else:
+                bits = bits * 2
+                lon_range[1] = middle
+        else:
+            middle = (lat_range[0] + lat_range[1]) / 2
+            if latitude >= middle:
+                bits = bits * 2 + 1
+                lat_range[0] = middle
+            else:
+                bits = bits * 2
+                lat_range[1] = middle
+        even = not even
+        bit += 1
+        if bit == 5:
+            geohash.append(GEOHASH_ALPHABET[bits])
+            bits, bit = 0, 0
+    return ''.join(geohash)
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    """Return the great-circle distance in km between two coordinates."""
+    lat1, lon1, lat2, lon2 = map(radians, (lat1, lon1, lat2, lon2))
+    a = sin((lat2 - lat1) / 2) ** 2 + cos(lat1) * cos(lat2) * sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * asin(sqrt(a))
+
+
+def bounding_box(latitude, longitude, radius):
+    """Return (min_lat, max_lat, min_lon, max_lon) enclosing a radius in km."""
+    delta_lat = radius / 111.32
+    lon_scale = max(cos(radians(latitude)), 0.01)
+    delta_lon = radius / (111.32 * lon_scale)
+    return (
+        max(latitude - delta_lat, -90.0),
+        min(latitude + delta_lat, 90.0),
+        max(longitude - delta_lon, -180.0),
+        min(longitude + delta_lon, 180.0),
+    )
+
+
+def geohash_cover(latitude, longitude, radius):
+    """Return the geohash prefixes whose cells cover a radius in km.
+
+    The longest precision whose cells are at least as large as the
+    radius is used, so the cell holding the center point plus its
+    eight neighbours always contain the whole search area.
+    """
+    precision = 1
+    for candidate in sorted(GEOHASH_CELL_SIZES):
+        height, width = GEOHASH_CELL_SIZES[candidate]
+        if min(height, width * max(cos(radians(latitude)), 0.01)) < radius:
+            break
+        precision = candidate
+
+    height, width = GEOHASH_CELL_SIZES[precision]
+    delta_lat = height / 111.32
+    delta_lon = width / (111.32 * max(cos(radians(latitude)), 0.01))
+
+    prefixes = set()
+    for lat_step in (-1, 0, 1):
+        for lon_step in (-1, 0, 1):
+            lat = min(max(latitude + lat_step * delta_lat, -90.0), 90.0)
+            lon = (longitude + lon_step * delta_lon + 180.0) % 360.0 - 180.0
+            prefixes.add(encode_geohash(lat, lon, precision))
+    return sorted(prefixes)
@@ -0,0 +1,127 @@
+"""Metrics utilities."""
+
+# Django
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+
+# Prometheus
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+# Utilities
+from contextlib import ExitStack
+from cride.utils.views import get_view_labels
+import os
+import time
+
+
+# Requests
+REQUEST_LATENCY = Histogram(
+    'cride_http_request_duration_seconds',
+    'Time spent answering requests.',
+    ['method', 'view', 'action'],
+)
+RESPONSES = Counter(
+    'cride_http_responses_total',
+    'Responses sent by status code.',
+    ['method', 'view', 'action', 'status'],
+)
+REQUEST_QUERIES = Histogram(
+    'cride_http_request_db_queries',
+    'Database queries issued per request.',
+    ['method', 'view', 'action'],
+    buckets=(0, 1, 2, 4, 8, 16, 32, 64, 128, float('inf')),
+)
+
+# Celery
+TASK_RUNTIME = Histogram(
+    'cride_celery_task_duration_seconds',
+    'Time spent running tasks.',
+    ['task', 'state'],
+    buckets=(.01, .05, .1, .25, .5, 1, 2.5, 5, 10, 30, 60, 120, 300, float('inf')),
+)
+TASK_QUEUE_WAIT = Histogram(
+    'cride_celery_task_queue_wait_seconds',
+    'Time tasks spent in the queue between their publication, or their eta if later, and their start.',
+    ['task', 'retried'],
+    buckets=(.01, .05, .1, .5, 1, 5, 10, 30, 60, 300, 600, float('inf')),
+)
+
+# Cache
+DIRECTORY_CACHE_LOOKUPS = Counter(
+    'cride_directory_cache_lookups_total',
+    'Public circles directory page lookups in the cache.',
+    ['result'],
+)
+
+
+def get_registry():
+    """Return the registry to export.
+
+    When PROMETHEUS_MULTIPROC_DIR is set every process writes its
+    metrics there and they are aggregated on collection, so any
+    Gunicorn or Celery worker exports the metrics of all of them.
+    """
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def export_metrics(request):
+    """Return the metrics in the Prometheus text format.
+
+    Scrapers must send the METRICS_TOKEN, if set, as a bearer token.
+    """
+    token = settings.METRICS_TOKEN
+    if token and not constant_time_compare(request.META.get('HTTP_AUTHORIZATION', ''), 'Bearer ' + token):
+        return HttpResponseForbidden()
+    return HttpResponse(generate_latest(get_registry()), content_type=CONTENT_TYPE_LATEST)
+
+
+class QueryCounter:
+    """Database execute wrapper counting the queries."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class MetricsMiddleware:
+    """Record the latency, status and query count of every request.
+
+    Requests are labelled with their URL name and viewset action, the
+    ones not resolved to a view share the "unresolved" view.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        queries = QueryCounter()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(queries))
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - start
+
+        view, action = get_view_labels(request)
+        labels = {'method': request.method, 'view': view or 'unresolved', 'action': action or ''}
+        REQUEST_LATENCY.labels(**labels).observe(elapsed)
+        REQUEST_QUERIES.labels(**labels).observe(queries.count)
+        RESPONSES.labels(status=response.status_code, **labels).inc()
+        return response
@@ -15,12 +15,12 @@ class CRideModel(models.Model):
     """
     created = models.DateTimeField(
         'created_at',
-        auto_now=True,
+        auto_now_add=True,
         help_text='Date time on which the object was created'
     )
     modified = models.DateTimeField(
         'modified_at',
-        auto_now_add=True,
+        auto_now=True,
         help_text='Date time on which the object was last modified'
     )
 
@@ -30,4 +30,3 @@ class CRideModel(models.Model):
         abstract = True
 
         get_latest_by = 'created'
-        ordering = ['-created', '-modified']
@@ -0,0 +1,184 @@
+"""Pagination utilities."""
+
+# Django
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Q
+from django.utils.translation import gettext_lazy as _
+
+# Django REST Framework
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+# Utilities
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+from datetime import date, datetime
+from decimal import Decimal
+import json
+
+
+class KeysetPagination(BasePagination):
+    """Keyset pagination following the queryset ordering.
+
+    Pages are fetched by filtering on the ordering values of the last
+    row seen, so deep pages cost the same as the first one and no total
+    count is computed. The primary key is appended to the ordering to
+    keep the cursors stable.
+
+    Requests providing `limit` or `offset` are paginated with
+    LimitOffsetPagination to keep backwards compatibility.
+    """
+
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = _('Invalid cursor')
+
+    offset_pagination_class = LimitOffsetPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Return a page of the queryset."""
+        self.offset_pagination = None
+        if self.offset_pagination_class.limit_query_param in request.query_params or \
+                self.offset_pagination_class.offset_query_param in request.query_params:
+            self.offset_pagination = self.offset_pagination_class()
+            return self.offset_pagination.paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset)
+
+        cursor = self.decode_cursor(queryset, request)
+        reverse = cursor is not None and cursor['reverse']
+        ordering = [self.invert(field) for field in self.ordering] if reverse else self.ordering
+
+        queryset = queryset.order_by(*ordering)
+        if cursor is not None:
+            queryset = queryset.filter(self.get_keyset_filter(ordering, cursor['position']))
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if reverse:
+            results.reverse()
+
+        self.has_next = cursor is not None if reverse else has_more
+        self.has_previous = has_more if reverse else cursor is not None
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        """Return the page along with the links to its neighbours."""
+        if self.offset_pagination is not None:
+            return self.offset_pagination.get_paginated_response(data)
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_page_size(self, request):
+        """Return the requested page size bounded by the maximum."""
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(page_size, 1), self.max_page_size)
+
+    def get_ordering(self, queryset):
+        """Return the queryset ordering ending with the primary key."""
+        ordering = [field for field in queryset.query.order_by if isinstance(field, str)]
+        if not ordering and queryset.query.default_ordering:
+            ordering = list(queryset.model._meta.ordering)
+        if not {'pk', '-pk', 'id', '-id'} & set(ordering):
+            ordering.append('pk')
+        return ordering
+
+    def invert(self, field):
+        """Return the opposite direction of an ordering field."""
+        return field[1:] if field.startswith('-') else '-' + field
+
+    def get_keyset_filter(self, ordering, position):
+        """Return the filter of the rows after the position in the ordering."""
+        keyset = Q()
+        for index, field in enumerate(ordering):
+            name = field.lstrip('-')
+            lookup = '{}__{}'.format(name, 'lt' if field.startswith('-') else 'gt')
+            condition = Q(**{lookup: position[index]})
+            for previous, value in zip(ordering[:index], position):
+                condition &= Q(**{previous.lstrip('-'): value})
+            keyset |= condition
+        return keyset
+
+    def get_position(self, instance):
+        """Return the ordering values of an instance."""
+        position = []
+        for field in self.ordering:
+            value = instance
+            for attr in field.lstrip('-').split('__'):
+                value = getattr(value, attr)
+            position.append(value)
+        return position
+
+    def encode_cursor(self, position, reverse):
+        """Return a link to the page after or before the position."""
+        position = [
+            value.isoformat() if isinstance(value, (date, datetime)) else
+            str(value) if isinstance(value, Decimal) else value
+            for value in position
+        ]
+        payload = json.dumps({'p': position, 'r': int(reverse)}, separators=(',', ':'))
+        cursor = urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, queryset, request):
+        """Return the position and direction of the requested cursor."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            payload = json.loads(urlsafe_b64decode(encoded + '=' * (-len(encoded) % 4)))
+            position, reverse = payload['p'], bool(payload['r'])
+            if not isinstance(position, list) or len(position) != len(self.ordering):
+                raise ValueError
+            position = [
+                self.to_python(queryset.model, field, value)
+                for field, value in zip(self.ordering, position)
+            ]
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+
+        return {'position': position, 'reverse': reverse}
+
+    def to_python(self, model, field, value):
+        """Convert a cursor value to the type of its field."""
+        name = field.lstrip('-')
+        if name == 'pk':
+            model_field = model._meta.pk
+        else:
+            try:
+                model_field = model._meta.get_field(name)
+            except FieldDoesNotExist:
+                return value
+        try:
+            return model_field.to_python(value)
+        except Exception:
+            raise ValueError
+
+    def get_next_link(self):
+        """Return the link to the next page."""
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.get_position(self.page[-1]), reverse=False)
+
+    def get_previous_link(self):
+        """Return the link to the previous page."""
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.get_position(self.page[0]), reverse=True)
@@ -0,0 +1,35 @@
+"""Parsers."""
+
+# Django REST Framework
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+# Utilities
+import msgpack
+import orjson
+
+
+class ORJSONParser(BaseParser):
+    """JSON parser backed by orjson."""
+
+    media_type = 'application/json'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        """Parse the incoming JSON bytestream."""
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - {}'.format(exc))
+
+
+class MessagePackParser(BaseParser):
+    """MessagePack parser."""
+
+    media_type = 'application/msgpack'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        """Parse the incoming MessagePack bytestream."""
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except (ValueError, msgpack.ExtraData, msgpack.FormatError, msgpack.StackError) as exc:
+            raise ParseError('MessagePack parse error - {}'.format(exc))
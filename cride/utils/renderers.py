@@ -0,0 +1,59 @@
+"""Renderers."""
+
+# Django REST Framework
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# Utilities
+import msgpack
+import orjson
+
+
+def encode_default(obj):
+    """Encode the types not supported natively as DRF's JSON encoder does.
+
+    Keeps the representation of datetimes, decimals, lazy strings and
+    querysets identical to the one of DRF's JSONRenderer.
+    """
+    return JSONEncoder().default(obj)
+
+
+class ORJSONRenderer(BaseRenderer):
+    """JSON renderer backed by orjson."""
+
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+
+    options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Render data into JSON bytes."""
+        if data is None:
+            return b''
+
+        options = self.options
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            options |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=encode_default, option=options)
+
+    def get_indent(self, accepted_media_type, renderer_context):
+        """Return whether the client asked for an indented response."""
+        if accepted_media_type and 'indent' in accepted_media_type:
+            return True
+        return bool(renderer_context.get('indent'))
+
+
+class MessagePackRenderer(BaseRenderer):
+    """MessagePack renderer."""
+
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Render data into MessagePack bytes."""
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=encode_default, use_bin_type=True)
@@ -0,0 +1,250 @@
+"""Server timing utilities."""
+
+# Django
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+
+# Django REST Framework
+from rest_framework.generics import GenericAPIView
+from rest_framework.response import Response
+from rest_framework.serializers import BaseSerializer, ListSerializer, Serializer
+from rest_framework.views import APIView
+
+# Utilities
+from asgiref.local import Local
+from collections import defaultdict
+from contextlib import ExitStack, contextmanager
+from cride.utils.views import get_view_labels
+from functools import wraps
+import json
+import logging
+import random
+import threading
+import time
+
+
+logger = logging.getLogger('cride.timing')
+
+_state = Local()
+_installed = False
+
+CACHE_METHODS = (
+    'add', 'get', 'set', 'touch', 'delete', 'get_many', 'get_or_set',
+    'has_key', 'incr', 'decr', 'set_many', 'delete_many',
+)
+
+
+class RequestTimings:
+    """Durations and call counts measured along a request.
+
+    Nested measures of the same name, like a serializer reading the
+    data of another one or a cache method calling another, are only
+    counted once, by the outermost call.
+    """
+
+    # Header metrics and their descriptions, in order.
+    METRICS = (
+        ('db', 'Database'),
+        ('cache', 'Cache'),
+        ('initial', 'Authentication, permissions and throttling'),
+        ('permissions', 'Permissions'),
+        ('serializer', 'Serialization'),
+        ('render', 'Rendering'),
+        ('total', 'Total'),
+    )
+
+    def __init__(self):
+        self.durations = defaultdict(float)
+        self.counts = defaultdict(int)
+        self.depths = defaultdict(int)
+
+    @contextmanager
+    def measure(self, name):
+        """Add the time spent in the block to the named duration."""
+        self.depths[name] += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.depths[name] -= 1
+            if not self.depths[name]:
+                self.durations[name] += time.perf_counter() - start
+                self.counts[name] += 1
+
+    def as_header(self):
+        """Return the value of the Server-Timing header."""
+        metrics = []
+        for name, description in self.METRICS:
+            if name not in self.counts:
+                continue
+            if name == 'db':
+                description = '{} ({} queries)'.format(description, self.counts[name])
+            metrics.append('{};dur={:.1f};desc="{}"'.format(name, self.durations[name] * 1000, description))
+        return ', '.join(metrics)
+
+
+class ViewTimings:
+    """Timings of the sampled requests aggregated per view.
+
+    Every stage keeps the number of requests it was measured in, the
+    calls made, and the total and maximum time per request. Aggregates
+    are handed out and reset once the interval elapsed, checked as
+    requests are added.
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.views = {}
+        self.started = time.monotonic()
+
+    def add(self, key, timings):
+        """Aggregate the timings of a request, return the due aggregates."""
+        with self.lock:
+            view = self.views.setdefault(key, {'requests': 0, 'stages': {}})
+            view['requests'] += 1
+            for name, _ in RequestTimings.METRICS:
+                if name not in timings.counts:
+                    continue
+                stage = view['stages'].setdefault(name, {'count': 0, 'calls': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+                duration = timings.durations[name] * 1000
+                stage['count'] += 1
+                stage['calls'] += timings.counts[name]
+                stage['total_ms'] += duration
+                stage['max_ms'] = max(stage['max_ms'], duration)
+
+            elapsed = time.monotonic() - self.started
+            if elapsed < self.interval:
+                return None, {}
+            views, self.views, self.started = self.views, {}, time.monotonic()
+        return elapsed, views
+
+
+def get_timings():
+    """Return the timings of the current request, None if it isn't sampled."""
+    return getattr(_state, 'timings', None)
+
+
+@contextmanager
+def measure(name):
+    """Measure a block if the current request is sampled."""
+    timings = get_timings()
+    if timings is None:
+        yield
+    else:
+        with timings.measure(name):
+            yield
+
+
+def timed(name):
+    """Decorate a function to measure its calls."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with measure(name):
+                return func(*args, **kwargs)
+        wrapper.timed = True
+        return wrapper
+    return decorator
+
+
+def time_query(execute, sql, params, many, context):
+    """Database execute wrapper measuring every query."""
+    with measure('db'):
+        return execute(sql, params, many, context)
+
+
+def instrument(cls, attribute, name):
+    """Replace a method or property of a class by its measured version."""
+    value = cls.__dict__.get(attribute)
+    if isinstance(value, property):
+        if not getattr(value.fget, 'timed', False):
+            setattr(cls, attribute, property(timed(name)(value.fget), value.fset, value.fdel, value.__doc__))
+    elif callable(value) and not getattr(value, 'timed', False):
+        setattr(cls, attribute, timed(name)(value))
+
+
+def install_hooks():
+    """Measure the DRF views lifecycle, the serializers and the caches.
+
+    Hooks go on the base classes, so every view and serializer is
+    measured without changes.
+    """
+    global _installed
+    if _installed:
+        return
+    _installed = True
+
+    instrument(APIView, 'initial', 'initial')
+    instrument(APIView, 'check_permissions', 'permissions')
+    instrument(APIView, 'check_object_permissions', 'permissions')
+    instrument(GenericAPIView, 'get_serializer', 'serializer')
+    for serializer_class in (BaseSerializer, Serializer, ListSerializer):
+        instrument(serializer_class, 'data', 'serializer')
+    instrument(Response, 'rendered_content', 'render')
+
+    for backend in {type(caches[alias]) for alias in settings.CACHES}:
+        for method in CACHE_METHODS:
+            for cls in backend.__mro__:
+                if method in cls.__dict__:
+                    instrument(cls, method, 'cache')
+                    break
+
+
+class ServerTimingMiddleware:
+    """Report where the time of sampled requests goes.
+
+    Sampled requests, a SERVER_TIMING_SAMPLE_RATE share of them, get a
+    Server-Timing header with the time spent in the database, cache,
+    DRF initial checks, permissions, serialization and rendering. Their
+    timings are aggregated per view and action, and logged as one JSON
+    line per view every SERVER_TIMING_LOG_INTERVAL seconds; the pending
+    aggregates of a process are lost when it exits.
+
+    The body of streamed responses is produced after the response
+    leaves the middleware, so its time is not reported.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, 'SERVER_TIMING_SAMPLE_RATE', 1.0)
+        self.view_timings = ViewTimings(getattr(settings, 'SERVER_TIMING_LOG_INTERVAL', 60))
+        install_hooks()
+
+    def __call__(self, request):
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        timings = _state.timings = RequestTimings()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(time_query))
+                with timings.measure('total'):
+                    response = self.get_response(request)
+        finally:
+            del _state.timings
+
+        response['Server-Timing'] = timings.as_header()
+        view, action = get_view_labels(request)
+        elapsed, views = self.view_timings.add((request.method, view, action), timings)
+        if views:
+            self.log(elapsed, views)
+        return response
+
+    def log(self, elapsed, views):
+        """Log the aggregated timings as one JSON line per view."""
+        for (method, view, action), aggregates in views.items():
+            for stage in aggregates['stages'].values():
+                stage['total_ms'] = round(stage['total_ms'], 2)
+                stage['max_ms'] = round(stage['max_ms'], 2)
+            logger.info(json.dumps({
+                'event': 'server_timing',
+                'interval_s': round(elapsed, 1),
+                'method': method,
+                'view': view,
+                'action': action,
+                'requests': aggregates['requests'],
+                'stages': aggregates['stages'],
+            }, separators=(',', ':')))
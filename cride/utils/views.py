@@ -0,0 +1,154 @@
+"""Views utilities."""
+
+# Django
+from django.http import StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+# Django REST Framework
+from rest_framework.response import Response
+
+# Renderers
+from cride.utils.renderers import ORJSONRenderer
+
+# Utilities
+from hashlib import md5
+
+
+class StreamingListMixin:
+    """Stream list responses requested with `?stream=true`.
+
+    Instead of rendering a page, the whole filtered queryset is
+    serialized as a JSON array which is sent as it is built, so memory
+    stays bounded by the chunk size whatever the number of rows. The
+    primary keys are iterated with a database cursor and each chunk of
+    rows is fetched along with its prefetched relations.
+
+    Errors raised once streaming started can't change the response
+    status, so the body is truncated instead.
+    """
+
+    stream_query_param = 'stream'
+    stream_chunk_size = 500
+    stream_renderer_class = ORJSONRenderer
+
+    def list(self, request, *args, **kwargs):
+        """Return a streamed list if requested, a paginated one otherwise."""
+        if request.query_params.get(self.stream_query_param, '').lower() not in ('1', 'true'):
+            return super(StreamingListMixin, self).list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        return StreamingHttpResponse(
+            self.stream(queryset),
+            content_type=self.stream_renderer_class.media_type
+        )
+
+    def stream(self, queryset):
+        """Yield the serialized queryset as a JSON array."""
+        renderer = self.stream_renderer_class()
+        yield b'['
+        separator = b''
+        for chunk in self.iterate_chunks(queryset):
+            for item in self.get_serializer(chunk, many=True).data:
+                yield separator + renderer.render(item)
+                separator = b','
+        yield b']'
+
+    def iterate_chunks(self, queryset):
+        """Yield the rows of the queryset in chunks, keeping their order."""
+        pks = queryset.values_list('pk', flat=True).iterator(chunk_size=self.stream_chunk_size)
+        chunk = []
+        for pk in pks:
+            chunk.append(pk)
+            if len(chunk) == self.stream_chunk_size:
+                yield self.fetch_chunk(queryset, chunk)
+                chunk = []
+        if chunk:
+            yield self.fetch_chunk(queryset, chunk)
+
+    def fetch_chunk(self, queryset, pks):
+        """Return the rows of the given primary keys in the same order."""
+        rows = {obj.pk: obj for obj in queryset.filter(pk__in=pks)}
+        return [rows[pk] for pk in pks if pk in rows]
+
+
+class ConditionalGetMixin:
+    """Answer conditional GET requests without serializing anything.
+
+    Detail responses are validated against the modified timestamps
+    returned by get_object_stamps(), the object's and the ones of the
+    data embedded from other models, and list responses against the
+    stamp returned by get_list_version(), lists of views returning None
+    are not validated.
+
+    ETags also depend on the requesting user, the path and the
+    negotiated media type. Last-Modified is only sent along when the
+    version is made of the modified timestamps alone.
+    """
+
+    def get_list_version(self):
+        """Return a stamp changing whenever the listed rows change."""
+        return None
+
+    def get_object_stamps(self, instance):
+        """Return the modified timestamps of the object and its embedded data."""
+        return [instance.modified]
+
+    def get_object_version(self, instance):
+        """Return the stamp and last modification date of an object."""
+        stamps = self.get_object_stamps(instance)
+        return [stamp.isoformat() for stamp in stamps], max(stamps)
+
+    def get_etag(self, version):
+        """Return the ETag of the response to the current request."""
+        parts = (
+            version,
+            self.request.user.pk,
+            self.request.get_full_path(),
+            self.request.accepted_media_type,
+        )
+        return quote_etag(md5('|'.join(str(part) for part in parts).encode()).hexdigest())
+
+    def list(self, request, *args, **kwargs):
+        """Return the list unless the client's copy is still valid."""
+        version = self.get_list_version()
+        if version is None:
+            return super(ConditionalGetMixin, self).list(request, *args, **kwargs)
+        return self.get_conditional_response(
+            lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs),
+            etag=self.get_etag(version)
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        """Return the object unless the client's copy is still valid."""
+        instance = self.get_object()
+        version, last_modified = self.get_object_version(instance)
+        return self.get_conditional_response(
+            lambda: Response(self.get_serializer(instance).data),
+            etag=self.get_etag(version),
+            last_modified=last_modified
+        )
+
+    def get_conditional_response(self, respond, etag, last_modified=None):
+        """Return 304 if the client's copy matches, respond() otherwise."""
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(self.request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = respond()
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if timestamp is not None:
+                response['Last-Modified'] = http_date(timestamp)
+        return response
+
+
+def get_view_labels(request):
+    """Return the URL name and the viewset action that handled a request.
+
+    Both are None for requests not resolved to a view.
+    """
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return None, None
+    actions = getattr(match.func, 'actions', None) or {}
+    return match.view_name, actions.get(request.method.lower())